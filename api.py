@@ -143,25 +143,37 @@ This module provides REST API endpoints for PDF upload, document management,
 chat sessions, and RAG-powered question answering.
 """
 
-from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, status
+from fastapi import FastAPI, UploadFile, File, Depends, HTTPException, BackgroundTasks, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select, delete
+from sqlalchemy.orm import Session, raiseload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import BaseModel, Field, validator
+from cachetools import TTLCache
 from typing import Optional, List
-import shutil
+import aiofiles
+import asyncio
+import hashlib
+import json
 import os
 import uuid
 from datetime import datetime
 import logging
 
-from db import init_db, get_db, Document, ChatSession, ChatMessage, QueryMetric
+# Configure logging before the local modules below log their setup
+logging.basicConfig(level=logging.INFO)
+
+from config import cfg
+from db import (
+    init_db, get_db, get_async_db, afast_insert, save_chunks, bulk_writer, SessionLocal,
+    Document, DocumentChunk, ChatSession, ChatMessage
+)
 from pdf_processor import pdf_proc
-from vector_db import vdb
-from rag_engine import rag
+from vector_db import VectorDB, get_vdb
+from rag_engine import RAGEngine, get_rag
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize FastAPI app
@@ -183,10 +195,22 @@ app.add_middleware(
 # Ensure uploads directory exists
 os.makedirs("uploads", exist_ok=True)
 
+# Size of each read when streaming uploads to disk (1 MiB)
+UPLOAD_CHUNK_BYTES = 1 << 20
+
+# Every PDF file starts with this header
+PDF_MAGIC = b"%PDF-"
+
+# Session IDs recently seen in the database; saves a SELECT on repeat POST /session
+SESSION_EXISTS = TTLCache(maxsize=10_000, ttl=30)
+
+# Caps how many PDFs are extracted and embedded at once in this worker
+UPLOAD_SEM = asyncio.Semaphore(cfg.MAX_CONCURRENT_UPLOADS)
+
 
 @app.on_event("startup")
 def startup():
-    """Initialize database tables on application startup."""
+    """Initialize database tables and load the shared models on worker startup."""
     try:
         init_db()
         logger.info("Database initialized successfully")
@@ -194,6 +218,255 @@ def startup():
         logger.error(f"Failed to initialize database: {e}")
         raise
 
+    # Build the embedding model and Qdrant client once per worker here,
+    # so the first request doesn't pay for it
+    get_vdb()
+    get_rag()
+
+
+@app.on_event("startup")
+async def start_bulk_writer():
+    """Start the background task that batch-inserts chat messages and metrics."""
+    app.state.bulk_writer_task = asyncio.create_task(bulk_writer.run())
+
+
+@app.on_event("shutdown")
+async def stop_bulk_writer():
+    """Stop the bulk writer, flushing any rows still buffered."""
+    app.state.bulk_writer_task.cancel()
+    try:
+        await app.state.bulk_writer_task
+    except asyncio.CancelledError:
+        pass
+    logger.info("Bulk writer flushed and stopped")
+
+
+def _copy_and_hash(src, dst_path: str) -> str:
+    """
+    Copy a disk-backed upload to dst_path, hashing it in the same pass.
+
+    Reads into one reused buffer, so each block is read once and handed to
+    both the hash and the write without a per-block allocation.
+
+    Args:
+        src: Readable binary file object
+        dst_path (str): Destination path
+
+    Returns:
+        str: SHA-256 hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    buf = bytearray(UPLOAD_CHUNK_BYTES)
+    view = memoryview(buf)
+    with open(dst_path, "wb") as dst:
+        while n := src.readinto(buf):
+            digest.update(view[:n])
+            dst.write(view[:n])
+    return digest.hexdigest()
+
+
+async def _save_upload(file: UploadFile, file_path: str) -> str:
+    """
+    Write an uploaded file to disk and hash it without blocking the event loop.
+
+    Starlette spools uploads larger than 1 MiB to a temporary file; those
+    are copied and hashed in one pass in a worker thread. The hash needs
+    every byte in userspace anyway, so a kernel-side sendfile copy would
+    only add a second read. In-memory uploads use a chunked aiofiles copy.
+
+    Args:
+        file (UploadFile): Uploaded file
+        file_path (str): Destination path
+
+    Returns:
+        str: SHA-256 hex digest of the file content
+    """
+    # One thread hop for the whole copy instead of one per aiofiles chunk
+    if getattr(file.file, "_rolled", False):
+        return await asyncio.to_thread(_copy_and_hash, file.file, file_path)
+
+    digest = hashlib.sha256()
+    async with aiofiles.open(file_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_BYTES):
+            digest.update(chunk)
+            await f.write(chunk)
+    return digest.hexdigest()
+
+
+def _remove_upload(file_path: Optional[str]) -> None:
+    """
+    Remove a temporary upload file, logging instead of raising on failure.
+
+    Args:
+        file_path (str, optional): Path of the file to remove
+    """
+    if file_path and os.path.exists(file_path):
+        try:
+            os.remove(file_path)
+            logger.info(f"Cleaned up temporary file: {file_path}")
+        except Exception as e:
+            logger.warning(f"Failed to remove temporary file: {e}")
+
+
+def _save_chunk_batch(doc_id: int, chunks: dict, start: int) -> None:
+    """
+    Store one batch of a document's chunks in its own database session.
+
+    Args:
+        doc_id (int): Owning document ID
+        chunks (dict): Columnar chunk batch to store
+        start (int): chunk_idx of the first chunk in the batch
+
+    Raises:
+        SQLAlchemyError: If the insert fails (after rolling back)
+    """
+    db = SessionLocal()
+    try:
+        save_chunks(db, doc_id, chunks, start)
+        db.commit()
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to store chunks for document {doc_id}: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _set_document_status(
+        doc_id: int,
+        doc_status: str,
+        page_count: Optional[int] = None
+) -> bool:
+    """
+    Update a document's processing status in its own database session.
+
+    A failed document also loses the chunk batches stored so far.
+
+    Args:
+        doc_id (int): Document ID to update
+        doc_status (str): New status (completed or failed)
+        page_count (int, optional): Page count to store
+
+    Returns:
+        bool: False if the document was deleted in the meantime
+
+    Raises:
+        SQLAlchemyError: If the update fails (after rolling back)
+    """
+    db = SessionLocal()
+    try:
+        doc = db.get(Document, doc_id)
+        if doc is None:
+            logger.warning(f"Document {doc_id} was deleted before status update")
+            return False
+        doc.status = doc_status
+        if page_count is not None:
+            doc.page_count = page_count
+        if doc_status == "failed":
+            db.execute(delete(DocumentChunk).where(DocumentChunk.doc_id == doc_id))
+        db.commit()
+        return True
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to update status for document {doc_id}: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+async def process_document(doc_id: int, file_path: str, filename: str, content_hash: str) -> None:
+    """
+    Background job: extract, chunk and index an uploaded PDF.
+
+    Runs after the upload response has been sent. Blocking work is pushed
+    to worker threads so the event loop keeps serving requests, and at most
+    MAX_CONCURRENT_UPLOADS documents are processed at once. Chunks are
+    embedded, indexed and stored one batch at a time as pages are read, so
+    memory does not grow with the document. Marks the document completed
+    or failed and always removes the temporary file.
+    If the document fails or is deleted after its chunks were indexed,
+    those points are removed again so they never stay searchable.
+
+    Args:
+        doc_id (int): Database ID of the document
+        file_path (str): Path of the saved upload
+        filename (str): Original filename
+        content_hash (str): SHA-256 of the upload, keys the extraction cache
+    """
+    vdb = get_vdb()
+    rag = get_rag()
+    indexed = False
+
+    try:
+        async with UPLOAD_SEM:
+            batches = pdf_proc.iter_chunk_batches(file_path, content_hash)
+            chunk_count = 0
+            page_count = 0
+            # Extraction is blocking, so each batch is pulled in a worker thread
+            while (item := await asyncio.to_thread(next, batches, None)) is not None:
+                chunks, page_count = item
+                if not chunks["text"]:
+                    continue
+
+                # Set first: a batch can be partly upserted when it fails.
+                # Waiting also keeps extraction from running ahead of Qdrant,
+                # and makes the points searchable before the document is
+                # marked completed and the answer cache version bumped
+                indexed = True
+                await vdb.aadd_chunks(chunks, doc_id, filename, wait=True, start=chunk_count)
+                await asyncio.to_thread(_save_chunk_batch, doc_id, chunks, chunk_count)
+                chunk_count += len(chunks["text"])
+
+            if not chunk_count:
+                raise ValueError("No text could be extracted from the PDF")
+            logger.info(f"Indexed {chunk_count} chunks from {page_count} pages for document {doc_id}")
+
+        if not await asyncio.to_thread(_set_document_status, doc_id, "completed", page_count):
+            # Deleted while processing; drop points indexed after delete_document ran
+            await vdb.adelete_doc(doc_id)
+            return
+
+    except Exception as e:
+        logger.error(f"Processing failed for document {doc_id}: {e}")
+        if indexed:
+            # A failed document must not keep answering from its points
+            try:
+                await vdb.adelete_doc(doc_id)
+            except Exception:
+                pass  # already logged by adelete_doc
+        try:
+            await asyncio.to_thread(_set_document_status, doc_id, "failed")
+        except SQLAlchemyError:
+            pass  # already logged; nothing more a background job can do
+
+    else:
+        await asyncio.to_thread(rag.invalidate_cache)
+
+    finally:
+        _remove_upload(file_path)
+
+
+def _preview_sources(sources: Optional[List[dict]], preview_len: Optional[int]) -> Optional[List[dict]]:
+    """
+    Replace each source's full text with a short text_preview.
+
+    Args:
+        sources (List[dict], optional): Sources as stored or returned by the RAG engine
+        preview_len (int, optional): Maximum preview length; None keeps the full text
+
+    Returns:
+        List[dict]: Sources with text_preview instead of text, or the input unchanged
+    """
+    if preview_len is None or not sources:
+        return sources
+
+    previews = []
+    for s in sources:
+        text = s["text"]
+        preview = text[:preview_len] + "..." if len(text) > preview_len else text
+        previews.append({k: v for k, v in s.items() if k != "text"} | {"text_preview": preview})
+    return previews
+
 
 # Pydantic models for request/response validation
 class QueryRequest(BaseModel):
@@ -203,6 +476,9 @@ class QueryRequest(BaseModel):
     top_k: Optional[int] = Field(5, ge=1, le=20, description="Number of results to retrieve")
     doc_filter: Optional[int] = Field(None, description="Filter by document ID")
     only_if_sources: Optional[bool] = Field(False, description="Only answer if sources found")
+    preview_len: Optional[int] = Field(
+        None, ge=1, description="Return sources as text_preview of at most this many characters"
+    )
 
     @validator('query')
     def query_not_empty(cls, v):
@@ -212,6 +488,22 @@ class QueryRequest(BaseModel):
         return v.strip()
 
 
+class BatchQueryRequest(BaseModel):
+    """Request model for answering several queries at once."""
+    queries: List[str] = Field(..., min_length=1, max_length=20, description="User query texts")
+    session_id: str = Field(..., description="Chat session identifier")
+    top_k: Optional[int] = Field(5, ge=1, le=20, description="Number of results to retrieve")
+    doc_filter: Optional[int] = Field(None, description="Filter by document ID")
+    only_if_sources: Optional[bool] = Field(False, description="Only answer if sources found")
+
+    @validator('queries', each_item=True)
+    def query_not_empty(cls, v):
+        """Validate each query is not empty or whitespace."""
+        if not v.strip():
+            raise ValueError("Query cannot be empty")
+        return v.strip()
+
+
 class SessionRequest(BaseModel):
     """Request model for session creation."""
     session_id: Optional[str] = Field(None, description="Optional session ID")
@@ -234,94 +526,99 @@ def root():
     }
 
 
-@app.post("/upload", tags=["Documents"], status_code=status.HTTP_201_CREATED)
-async def upload_pdf(file: UploadFile = File(...), db: Session = Depends(get_db)):
+@app.post("/upload", tags=["Documents"], status_code=status.HTTP_202_ACCEPTED)
+async def upload_pdf(
+        background_tasks: BackgroundTasks,
+        response: Response,
+        file: UploadFile = File(...),
+        db: AsyncSession = Depends(get_async_db)
+):
     """
-    Upload and process a PDF file.
+    Upload a PDF file and queue it for processing.
 
-    Accepts a PDF file, extracts text, chunks it, and indexes into vector database.
-    Stores document metadata in PostgreSQL.
+    Saves the file, creates a document record with status "processing" and
+    returns immediately. Text extraction, chunking and indexing run in a
+    background task; poll GET /documents/{doc_id} for the final status.
+    If a document with identical content is already indexed, that document
+    is returned instead (HTTP 200) and nothing is re-embedded.
 
     Args:
+        background_tasks (BackgroundTasks): FastAPI background task queue
+        response (Response): Outgoing response, used to set the status code
         file (UploadFile): PDF file to upload
-        db (Session): Database session
+        db (AsyncSession): Async database session
 
     Returns:
-        dict: Document information including ID, filename, status, and page count
+        dict: Document ID, filename and queued status (or the existing
+              document with duplicate=True)
 
     Raises:
-        HTTPException: If file is not PDF or processing fails
+        HTTPException: If file content is not PDF or cannot be saved
     """
-    # Validate file type
-    if not file.filename.lower().endswith('.pdf'):
+    # Validate file type by its magic bytes before touching disk or database
+    head = await file.read(len(PDF_MAGIC))
+    if head != PDF_MAGIC:
         logger.warning(f"Invalid file type attempted: {file.filename}")
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only PDF files are allowed"
         )
+    await file.seek(0)
 
     file_path = None
-    doc = None
+    queued = False
 
     try:
-        # Save uploaded file temporarily
         file_path = f"uploads/{uuid.uuid4()}_{file.filename}"
-        with open(file_path, "wb") as f:
-            shutil.copyfileobj(file.file, f)
+        content_hash = await _save_upload(file, file_path)
         logger.info(f"Saved uploaded file: {file.filename}")
 
+        # Identical content already indexed: reuse it instead of re-embedding
+        existing = (await db.execute(
+            select(Document).where(
+                Document.content_hash == content_hash,
+                Document.status == "completed"
+            )
+        )).scalars().first()
+
+        if existing:
+            logger.info(f"Upload {file.filename} duplicates document {existing.id}, skipping processing")
+            response.status_code = status.HTTP_200_OK
+            return {
+                "id": existing.id,
+                "filename": existing.filename,
+                "status": existing.status,
+                "page_count": existing.page_count,
+                "duplicate": True
+            }
+
         # Create document record
-        doc = Document(filename=file.filename, status="processing")
+        doc = Document(filename=file.filename, status="processing", content_hash=content_hash)
         db.add(doc)
-        db.commit()
-        db.refresh(doc)
+        await db.commit()
         logger.info(f"Created document record with ID: {doc.id}")
 
-        # Process PDF
-        chunks, page_count = pdf_proc.process(file_path)
-        logger.info(f"Extracted {len(chunks)} chunks from {page_count} pages")
-
-        # Index chunks in vector database
-        vdb.add_chunks(chunks, doc.id, file.filename)
-        logger.info(f"Indexed {len(chunks)} chunks for document {doc.id}")
-
-        # Update document status
-        doc.status = "completed"
-        doc.page_count = page_count
-        db.commit()
+        # Hand off the heavy work; the task owns the temporary file from here
+        background_tasks.add_task(process_document, doc.id, file_path, file.filename, content_hash)
+        queued = True
 
         return {
             "id": doc.id,
             "filename": file.filename,
-            "status": "completed",
-            "page_count": page_count,
-            "chunks": len(chunks)
+            "status": "queued"
         }
 
     except Exception as e:
-        logger.error(f"Upload processing failed: {e}")
-
-        # Update document status to failed if record exists
-        if doc:
-            try:
-                doc.status = "failed"
-                db.commit()
-            except SQLAlchemyError:
-                db.rollback()
-
+        logger.error(f"Upload failed: {e}")
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to process PDF: {str(e)}"
+            detail=f"Failed to upload PDF: {str(e)}"
         )
 
     finally:
-        # Clean up temporary file
-        if file_path and os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                logger.info(f"Cleaned up temporary file: {file_path}")
-            except Exception as e:
-                logger.warning(f"Failed to remove temporary file: {e}")
+        if not queued:
+            _remove_upload(file_path)
 
 
 @app.get("/documents", tags=["Documents"])
@@ -336,19 +633,19 @@ def get_documents(db: Session = Depends(get_db)):
         list: List of document metadata dictionaries
     """
     try:
-        docs = db.query(Document).order_by(Document.upload_time.desc()).all()
+        # Plain column rows skip ORM object hydration for this read-only list
+        docs = db.execute(
+            select(
+                Document.id,
+                Document.filename,
+                Document.status,
+                Document.page_count,
+                Document.upload_time
+            ).order_by(Document.upload_time.desc())
+        ).mappings().all()
         logger.info(f"Retrieved {len(docs)} documents")
 
-        return [
-            {
-                "id": d.id,
-                "filename": d.filename,
-                "status": d.status,
-                "page_count": d.page_count,
-                "upload_time": d.upload_time
-            }
-            for d in docs
-        ]
+        return list(docs)
     except SQLAlchemyError as e:
         logger.error(f"Failed to retrieve documents: {e}")
         raise HTTPException(
@@ -357,14 +654,60 @@ def get_documents(db: Session = Depends(get_db)):
         )
 
 
+@app.get("/documents/{doc_id}", tags=["Documents"])
+def get_document(doc_id: int, db: Session = Depends(get_db)):
+    """
+    Retrieve a single document, e.g. to poll its processing status.
+
+    Args:
+        doc_id (int): Document ID
+        db (Session): Database session
+
+    Returns:
+        dict: Document metadata including status
+
+    Raises:
+        HTTPException: If document not found
+    """
+    try:
+        doc = db.get(Document, doc_id)
+    except SQLAlchemyError as e:
+        logger.error(f"Failed to retrieve document {doc_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve document"
+        )
+
+    if not doc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+
+    return {
+        "id": doc.id,
+        "filename": doc.filename,
+        "status": doc.status,
+        "page_count": doc.page_count,
+        "upload_time": doc.upload_time
+    }
+
+
 @app.delete("/documents/{doc_id}", tags=["Documents"])
-def delete_document(doc_id: int, db: Session = Depends(get_db)):
+async def delete_document(
+        doc_id: int,
+        db: AsyncSession = Depends(get_async_db),
+        vdb: VectorDB = Depends(get_vdb),
+        rag: RAGEngine = Depends(get_rag)
+):
     """
     Delete a document and its vector embeddings.
 
     Args:
         doc_id (int): Document ID to delete
-        db (Session): Database session
+        db (AsyncSession): Async database session
+        vdb (VectorDB): Shared vector database client
+        rag (RAGEngine): Shared RAG engine, whose answer cache is invalidated
 
     Returns:
         dict: Success message
@@ -373,7 +716,7 @@ def delete_document(doc_id: int, db: Session = Depends(get_db)):
         HTTPException: If document not found or deletion fails
     """
     try:
-        doc = db.query(Document).filter(Document.id == doc_id).first()
+        doc = await db.get(Document, doc_id)
 
         if not doc:
             logger.warning(f"Document {doc_id} not found")
@@ -383,12 +726,13 @@ def delete_document(doc_id: int, db: Session = Depends(get_db)):
             )
 
         # Delete from vector database
-        vdb.delete_doc(doc_id)
+        await vdb.adelete_doc(doc_id)
+        await asyncio.to_thread(rag.invalidate_cache)
         logger.info(f"Deleted vector embeddings for document {doc_id}")
 
         # Delete from PostgreSQL
-        db.delete(doc)
-        db.commit()
+        await db.delete(doc)
+        await db.commit()
         logger.info(f"Deleted document {doc_id} from database")
 
         return {"message": f"Document '{doc.filename}' deleted successfully"}
@@ -397,7 +741,7 @@ def delete_document(doc_id: int, db: Session = Depends(get_db)):
         raise
     except Exception as e:
         logger.error(f"Failed to delete document {doc_id}: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete document: {str(e)}"
@@ -405,13 +749,13 @@ def delete_document(doc_id: int, db: Session = Depends(get_db)):
 
 
 @app.post("/session", tags=["Sessions"], status_code=status.HTTP_201_CREATED)
-def create_session(req: SessionRequest, db: Session = Depends(get_db)):
+async def create_session(req: SessionRequest, db: AsyncSession = Depends(get_async_db)):
     """
     Create or retrieve a chat session.
 
     Args:
         req (SessionRequest): Session request with optional session_id
-        db (Session): Database session
+        db (AsyncSession): Async database session
 
     Returns:
         dict: Session ID
@@ -419,21 +763,27 @@ def create_session(req: SessionRequest, db: Session = Depends(get_db)):
     try:
         sid = req.session_id or str(uuid.uuid4())
 
-        existing = db.query(ChatSession).filter(ChatSession.session_id == sid).first()
+        if sid in SESSION_EXISTS:
+            return {"session_id": sid}
+
+        existing = (await db.execute(
+            select(ChatSession).where(ChatSession.session_id == sid)
+        )).scalars().first()
 
         if not existing:
             session = ChatSession(session_id=sid)
             db.add(session)
-            db.commit()
+            await db.commit()
             logger.info(f"Created new session: {sid}")
         else:
             logger.info(f"Retrieved existing session: {sid}")
 
+        SESSION_EXISTS[sid] = True
         return {"session_id": sid}
 
     except SQLAlchemyError as e:
         logger.error(f"Failed to create session: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to create session"
@@ -441,27 +791,53 @@ def create_session(req: SessionRequest, db: Session = Depends(get_db)):
 
 
 @app.get("/sessions", tags=["Sessions"])
-def get_sessions(db: Session = Depends(get_db)):
+async def get_sessions(include_messages: bool = False, db: AsyncSession = Depends(get_async_db)):
     """
     Retrieve all chat sessions.
 
+    With include_messages, every session's history is loaded in one extra
+    query (selectin) rather than one query per session; any other lazy
+    load raises instead of silently querying.
+
     Args:
-        db (Session): Database session
+        include_messages (bool): Also return each session's messages (default: False)
+        db (AsyncSession): Async database session
 
     Returns:
         list: List of session dictionaries
     """
     try:
-        sessions = db.query(ChatSession).order_by(ChatSession.created_at.desc()).all()
+        if include_messages:
+            rows = (await db.execute(
+                select(ChatSession)
+                .options(selectinload(ChatSession.messages), raiseload("*"))
+                .order_by(ChatSession.created_at.desc())
+            )).scalars().all()
+            logger.info(f"Retrieved {len(rows)} sessions with messages")
+            return [
+                {
+                    "session_id": s.session_id,
+                    "created_at": s.created_at,
+                    "messages": [
+                        {
+                            "role": m.role,
+                            "content": m.content,
+                            "sources": m.sources,
+                            "timestamp": m.timestamp
+                        }
+                        for m in s.messages
+                    ]
+                }
+                for s in rows
+            ]
+
+        sessions = (await db.execute(
+            select(ChatSession.session_id, ChatSession.created_at)
+            .order_by(ChatSession.created_at.desc())
+        )).mappings().all()
         logger.info(f"Retrieved {len(sessions)} sessions")
 
-        return [
-            {
-                "session_id": s.session_id,
-                "created_at": s.created_at
-            }
-            for s in sessions
-        ]
+        return list(sessions)
     except SQLAlchemyError as e:
         logger.error(f"Failed to retrieve sessions: {e}")
         raise HTTPException(
@@ -471,33 +847,40 @@ def get_sessions(db: Session = Depends(get_db)):
 
 
 @app.get("/messages/{session_id}", tags=["Sessions"])
-def get_messages(session_id: str, db: Session = Depends(get_db)):
+async def get_messages(
+        session_id: str,
+        preview_len: Optional[int] = Query(None, ge=1),
+        db: AsyncSession = Depends(get_async_db)
+):
     """
     Retrieve chat messages for a session.
 
     Args:
         session_id (str): Session identifier
-        db (Session): Database session
+        preview_len (int, optional): Return sources as text_preview of at most
+            this many characters instead of their full text
+        db (AsyncSession): Async database session
 
     Returns:
         list: List of message dictionaries
     """
     try:
-        msgs = db.query(ChatMessage).filter(
-            ChatMessage.session_id == session_id
-        ).order_by(ChatMessage.timestamp).all()
+        msgs = (await db.execute(
+            select(
+                ChatMessage.role,
+                ChatMessage.content,
+                ChatMessage.sources,
+                ChatMessage.timestamp
+            )
+            .where(ChatMessage.session_id == session_id)
+            .order_by(ChatMessage.timestamp)
+        )).mappings().all()
 
         logger.info(f"Retrieved {len(msgs)} messages for session {session_id}")
 
-        return [
-            {
-                "role": m.role,
-                "content": m.content,
-                "sources": m.sources,
-                "timestamp": m.timestamp
-            }
-            for m in msgs
-        ]
+        if preview_len is not None:
+            return [{**m, "sources": _preview_sources(m["sources"], preview_len)} for m in msgs]
+        return list(msgs)
     except SQLAlchemyError as e:
         logger.error(f"Failed to retrieve messages: {e}")
         raise HTTPException(
@@ -507,61 +890,76 @@ def get_messages(session_id: str, db: Session = Depends(get_db)):
 
 
 @app.post("/query", tags=["RAG"])
-def query_rag(req: QueryRequest, db: Session = Depends(get_db)):
+async def query_rag(
+        req: QueryRequest,
+        db: AsyncSession = Depends(get_async_db),
+        rag: RAGEngine = Depends(get_rag)
+):
     """
     Process a RAG query and generate an answer.
 
-    Stores user message, retrieves relevant context, generates answer using LLM,
-    stores assistant response, and logs metrics.
+    Retrieves relevant context and generates an answer, then writes the user
+    and assistant turns in one short transaction, so the exchange commits
+    once or not at all and no connection is held during generation. A
+    failed generation writes nothing and leaves no orphan user turn. The
+    query metric is handed to the bulk writer.
 
     Args:
         req (QueryRequest): Query request with question and parameters
-        db (Session): Database session
+        db (AsyncSession): Async database session
+        rag (RAGEngine): Shared RAG engine
 
     Returns:
-        dict: Answer, sources, and response time
+        dict: Answer, sources, response time and whether it was a cache hit
 
     Raises:
         HTTPException: If query processing fails
     """
     try:
-        # Store user message
-        user_msg = ChatMessage(
-            session_id=req.session_id,
-            role="user",
-            content=req.query
-        )
-        db.add(user_msg)
-        db.commit()
-        logger.info(f"Stored user message for session {req.session_id}")
+        asked_at = datetime.utcnow()
 
         # Generate answer
-        result = rag.generate_answer(
+        result = await rag.agenerate_answer(
             req.query,
             req.top_k,
             req.doc_filter,
             req.only_if_sources
         )
+        if result.get("failed"):
+            raise HTTPException(
+                status_code=status.HTTP_502_BAD_GATEWAY,
+                detail=result["answer"]
+            )
 
-        # Store assistant message
-        assistant_msg = ChatMessage(
-            session_id=req.session_id,
-            role="assistant",
-            content=result["answer"],
-            sources=result["sources"]
-        )
-        db.add(assistant_msg)
-
-        # Store metrics
-        metric = QueryMetric(
+        # Commits on exit, rolls back if either insert raises
+        async with db.begin():
+            await afast_insert(db, ChatMessage, [
+                {
+                    "session_id": req.session_id,
+                    "role": "user",
+                    "content": req.query,
+                    "sources": None,
+                    "timestamp": asked_at
+                },
+                {
+                    "session_id": req.session_id,
+                    "role": "assistant",
+                    "content": result["answer"],
+                    "sources": result["sources"],
+                    "timestamp": datetime.utcnow()
+                }
+            ])
+
+        # Metrics are telemetry; batch them rather than widen the transaction
+        bulk_writer.log_metric(
             session_id=req.session_id,
             query=req.query,
             response_time=result["response_time"],
-            retrieval_count=result["retrieval_count"]
+            retrieval_count=result["retrieval_count"],
+            timestamp=datetime.utcnow(),
+            meta={"cache_hit": result["cache_hit"]}
         )
-        db.add(metric)
 
-        db.commit()
         logger.info(
             f"Query processed in {result['response_time']:.2f}s "
             f"with {result['retrieval_count']} sources"
@@ -569,10 +967,13 @@ def query_rag(req: QueryRequest, db: Session = Depends(get_db)):
 
         return {
             "answer": result["answer"],
-            "sources": result["sources"],
-            "response_time": result["response_time"]
+            "sources": _preview_sources(result["sources"], req.preview_len),
+            "response_time": result["response_time"],
+            "cache_hit": result["cache_hit"]
         }
 
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.warning(f"Invalid query: {e}")
         raise HTTPException(
@@ -581,7 +982,6 @@ def query_rag(req: QueryRequest, db: Session = Depends(get_db)):
         )
     except SQLAlchemyError as e:
         logger.error(f"Database error during query: {e}")
-        db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to process query"
@@ -594,31 +994,165 @@ def query_rag(req: QueryRequest, db: Session = Depends(get_db)):
         )
 
 
+@app.post("/query/stream", tags=["RAG"])
+async def query_rag_stream(req: QueryRequest, rag: RAGEngine = Depends(get_rag)):
+    """
+    Process a RAG query and stream the answer as newline-delimited JSON.
+
+    Emits {"delta": ...} lines while the answer is generated, then a final
+    {"done": true, "sources": ..., "response_time": ..., "retrieval_count": ...,
+    "cache_hit": ...} line. The exchange is persisted once the stream completes, unless
+    generation failed.
+
+    Args:
+        req (QueryRequest): Query request with question and parameters
+        rag (RAGEngine): Shared RAG engine
+
+    Returns:
+        StreamingResponse: application/x-ndjson event stream
+    """
+    asked_at = datetime.utcnow()
+
+    async def events():
+        parts = []
+        final = None
+
+        async for event in rag.stream_answer(
+                req.query,
+                req.top_k,
+                req.doc_filter,
+                req.only_if_sources
+        ):
+            if "delta" in event:
+                parts.append(event["delta"])
+            else:
+                final = event
+            yield json.dumps(event) + "\n"
+
+        if final["failed"]:
+            logger.warning("Streamed generation failed; exchange not persisted")
+            return
+
+        # Buffered and batch-inserted; the request session is gone by now
+        bulk_writer.log_message(
+            session_id=req.session_id,
+            role="user",
+            content=req.query,
+            timestamp=asked_at
+        )
+        bulk_writer.log_message(
+            session_id=req.session_id,
+            role="assistant",
+            content="".join(parts),
+            sources=final["sources"],
+            timestamp=datetime.utcnow()
+        )
+        bulk_writer.log_metric(
+            session_id=req.session_id,
+            query=req.query,
+            response_time=final["response_time"],
+            retrieval_count=final["retrieval_count"],
+            timestamp=datetime.utcnow(),
+            meta={"cache_hit": final["cache_hit"]}
+        )
+        logger.info(
+            f"Streamed query in {final['response_time']:.2f}s "
+            f"with {final['retrieval_count']} sources"
+        )
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+
+@app.post("/query/batch", tags=["RAG"])
+async def query_rag_batch(req: BatchQueryRequest, rag: RAGEngine = Depends(get_rag)):
+    """
+    Answer several queries concurrently.
+
+    Queries are answered in parallel and are not added to the chat
+    history; a metric is recorded for each.
+
+    Args:
+        req (BatchQueryRequest): Queries and shared retrieval parameters
+        rag (RAGEngine): Shared RAG engine
+
+    Returns:
+        list: One answer, sources, response time and cache-hit flag per query
+
+    Raises:
+        HTTPException: If query processing fails
+    """
+    try:
+        results = await rag.agenerate_answers(
+            req.queries,
+            req.top_k,
+            req.doc_filter,
+            req.only_if_sources
+        )
+
+        for query, result in zip(req.queries, results):
+            bulk_writer.log_metric(
+                session_id=req.session_id,
+                query=query,
+                response_time=result["response_time"],
+                retrieval_count=result["retrieval_count"],
+                timestamp=datetime.utcnow(),
+                meta={"cache_hit": result["cache_hit"], "batch": True}
+            )
+        logger.info(f"Batch of {len(results)} queries processed")
+
+        return [
+            {
+                "answer": r["answer"],
+                "sources": r["sources"],
+                "response_time": r["response_time"],
+                "cache_hit": r["cache_hit"]
+            }
+            for r in results
+        ]
+
+    except ValueError as e:
+        logger.warning(f"Invalid batch query: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error(f"Batch query processing failed: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to process queries: {str(e)}"
+        )
+
+
 @app.delete("/session/{session_id}", tags=["Sessions"])
-def clear_session(session_id: str, db: Session = Depends(get_db)):
+async def clear_session(session_id: str, db: AsyncSession = Depends(get_async_db)):
     """
     Clear all messages in a chat session.
 
     Args:
         session_id (str): Session identifier
-        db (Session): Database session
+        db (AsyncSession): Async database session
 
     Returns:
         dict: Success message
     """
     try:
-        deleted_count = db.query(ChatMessage).filter(
-            ChatMessage.session_id == session_id
-        ).delete()
+        # Plain bulk DELETE; no loaded ChatMessage objects need syncing
+        result = await db.execute(
+            delete(ChatMessage)
+            .where(ChatMessage.session_id == session_id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_count = result.rowcount
 
-        db.commit()
+        await db.commit()
         logger.info(f"Cleared {deleted_count} messages from session {session_id}")
 
         return {"message": f"Session cleared ({deleted_count} messages deleted)"}
 
     except SQLAlchemyError as e:
         logger.error(f"Failed to clear session: {e}")
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to clear session"
@@ -628,4 +1162,14 @@ def clear_session(session_id: str, db: Session = Depends(get_db)):
 if __name__ == "__main__":
     import uvicorn
 
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # Multiple workers need the import-string form; each worker process
+    # loads its own embedding model, Gemini client and caches.
+    uvicorn.run(
+        "api:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=cfg.WEB_CONCURRENCY,
+        loop="uvloop",
+        http="httptools",
+        log_level="info"
+    )
\ No newline at end of file
@@ -1,12 +1,16 @@
 # clear_db.py
-from db import engine, Document
+from db import engine, bump_corpus_version, Document
+from sqlalchemy import select, delete
 from sqlalchemy.orm import Session
-from vector_db import vdb
+from vector_db import get_vdb
+
+vdb = get_vdb()
 
 with Session(engine) as session:
-    docs = session.query(Document).all()
-    for doc in docs:
-        vdb.delete_doc(doc.id)
-    session.query(Document).delete()
+    doc_ids = list(session.execute(select(Document.id)).scalars())
+    vdb.delete_docs_bulk(doc_ids)
+    session.execute(delete(Document))
     session.commit()
-    print("All documents deleted!")
\ No newline at end of file
+    # Bumping the version also retires the running workers' cached answers
+    vdb.cache_clear(bump_corpus_version())
+    print("All documents deleted!")
@@ -1,6 +1,9 @@
 # clear_qdrant.py
-from vector_db import vdb
+from vector_db import get_vdb
 
-vdb.client.delete_collection("pdf_chunks")
+vdb = get_vdb()
+
+vdb.client.delete_collection(vdb.collection)
+vdb.client.delete_collection(vdb.cache_collection)
 vdb._init_collection()
-print("Qdrant cleared!")
\ No newline at end of file
+print("Qdrant cleared!")
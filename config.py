@@ -32,6 +32,7 @@ and embedding parameters.
 """
 
 import os
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -51,12 +52,29 @@ class Config:
         POSTGRES_DB (str): PostgreSQL database name
         POSTGRES_USER (str): PostgreSQL username
         POSTGRES_PASSWORD (str): PostgreSQL password
+        POSTGRES_POOL_SIZE (int): Persistent connections kept per engine in each worker
+        POSTGRES_MAX_OVERFLOW (int): Extra connections allowed per engine in each worker
+        POSTGRES_POOL_RECYCLE (int): Seconds before a pooled connection is replaced
+        POSTGRES_POOL_TIMEOUT (int): Seconds to wait for a free pooled connection
+        BULK_WRITE_BATCH_SIZE (int): Maximum chat/metric rows inserted per flush
+        BULK_WRITE_INTERVAL (float): Maximum seconds a buffered row waits before flushing
         QDRANT_HOST (str): Qdrant vector database host
         QDRANT_PORT (int): Qdrant vector database port
+        QDRANT_GRPC_PORT (int): Qdrant gRPC port
+        QDRANT_PREFER_GRPC (bool): Use gRPC instead of HTTP for Qdrant calls
         EMBEDDING_MODEL (str): Sentence transformer model name
+        EMBEDDING_COMPILE (bool): Compile the embedding model with torch.compile on GPU
         CHUNK_SIZE (int): Number of words per text chunk
         CHUNK_OVERLAP (int): Number of overlapping words between chunks
+        PDF_CACHE_DIR (str): Directory of the on-disk PDF extraction cache
+        PDF_EXTRACT_WORKERS (int): Processes used to extract text from large PDFs
+        MAX_CONCURRENT_UPLOADS (int): Maximum PDFs processed concurrently per worker
+        WEB_CONCURRENCY (int): Number of uvicorn worker processes
         TOP_K (int): Default number of results to retrieve
+        ANSWER_CACHE_SIZE (int): Maximum number of cached query responses
+        ANSWER_CACHE_TTL (int): Seconds a cached query response stays valid
+        CORPUS_VERSION_TTL (float): Seconds a worker reuses the corpus version it last read
+        SEMANTIC_CACHE_THRESHOLD (float): Minimum cosine similarity to reuse a cached answer
     """
 
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -65,12 +83,29 @@ class Config:
     POSTGRES_DB = os.getenv("POSTGRES_DB", "claude_rag_db")
     POSTGRES_USER = os.getenv("POSTGRES_USER", "postgres")
     POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "password")
+    POSTGRES_POOL_SIZE = int(os.getenv("POSTGRES_POOL_SIZE", 20))
+    POSTGRES_MAX_OVERFLOW = int(os.getenv("POSTGRES_MAX_OVERFLOW", 40))
+    POSTGRES_POOL_RECYCLE = int(os.getenv("POSTGRES_POOL_RECYCLE", 1800))
+    POSTGRES_POOL_TIMEOUT = int(os.getenv("POSTGRES_POOL_TIMEOUT", 30))
+    BULK_WRITE_BATCH_SIZE = int(os.getenv("BULK_WRITE_BATCH_SIZE", 1000))
+    BULK_WRITE_INTERVAL = float(os.getenv("BULK_WRITE_INTERVAL", 0.2))
     QDRANT_HOST = os.getenv("QDRANT_HOST", "localhost")
     QDRANT_PORT = int(os.getenv("QDRANT_PORT", 6333))
+    QDRANT_GRPC_PORT = int(os.getenv("QDRANT_GRPC_PORT", 6334))
+    QDRANT_PREFER_GRPC = os.getenv("QDRANT_PREFER_GRPC", "true").lower() == "true"
     EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+    EMBEDDING_COMPILE = os.getenv("EMBEDDING_COMPILE", "false").lower() == "true"
     CHUNK_SIZE = int(os.getenv("CHUNK_SIZE", 512))
     CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", 50))
+    PDF_CACHE_DIR = os.getenv("PDF_CACHE_DIR", "pdf_cache")
+    PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", min(4, os.cpu_count() or 1)))
+    MAX_CONCURRENT_UPLOADS = int(os.getenv("MAX_CONCURRENT_UPLOADS", 4))
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 2))
     TOP_K = int(os.getenv("TOP_K", 5))
+    ANSWER_CACHE_SIZE = int(os.getenv("ANSWER_CACHE_SIZE", 4096))
+    ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", 3600))
+    CORPUS_VERSION_TTL = float(os.getenv("CORPUS_VERSION_TTL", 1.0))
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", 0.95))
 
     def __init__(self):
         """
@@ -89,23 +124,60 @@ class Config:
                 f"CHUNK_OVERLAP ({self.CHUNK_OVERLAP}) must be less than CHUNK_SIZE ({self.CHUNK_SIZE})"
             )
 
+        if self.MAX_CONCURRENT_UPLOADS < 1:
+            raise ValueError(
+                f"MAX_CONCURRENT_UPLOADS ({self.MAX_CONCURRENT_UPLOADS}) must be at least 1"
+            )
+
+        if self.WEB_CONCURRENCY < 1:
+            raise ValueError(
+                f"WEB_CONCURRENCY ({self.WEB_CONCURRENCY}) must be at least 1"
+            )
+
     @property
     def db_url(self) -> str:
         """
         Construct PostgreSQL connection URL.
 
         Returns:
-            str: SQLAlchemy-compatible database URL
+            str: SQLAlchemy-compatible database URL (psycopg 3 driver)
         """
         return (
-            f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"postgresql+psycopg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
             f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def async_db_url(self) -> str:
+        """
+        Construct PostgreSQL connection URL for the asyncpg driver.
+
+        Returns:
+            str: SQLAlchemy-compatible async database URL
+        """
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}"
+            f"@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
+
+@lru_cache(maxsize=1)
+def get_cfg() -> Config:
+    """
+    Return the process-wide configuration instance.
+
+    Cached so every caller, including FastAPI dependencies, shares one
+    validated Config object.
+
+    Returns:
+        Config: Application configuration
+    """
+    return Config()
+
 
 # Global configuration instance
 try:
-    cfg = Config()
+    cfg = get_cfg()
 except ValueError as e:
     print(f"Configuration Error: {e}")
     raise
\ No newline at end of file
@@ -64,22 +64,116 @@ messages, and query metrics. It also provides database initialization
 and session management utilities.
 """
 
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, JSON
+from sqlalchemy import (
+    create_engine, inspect, insert, select, text, update, Column, Integer, String, Text, DateTime, Float, JSON,
+    Index, ForeignKey, LargeBinary, TypeDecorator
+)
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, relationship, sessionmaker
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.exc import SQLAlchemyError
 from datetime import datetime
-from typing import Generator
+from functools import lru_cache
+from typing import Any, AsyncGenerator, Dict, Generator, List, Optional
+import asyncio
+import json
 import logging
+import zstandard
 
 from config import cfg
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
+# Chunk counts above this are written with COPY instead of INSERT
+COPY_THRESHOLD = 100
+
+# Binary, GIN-indexable jsonb on PostgreSQL; plain JSON on other dialects
+JsonType = JSON().with_variant(JSONB(), "postgresql")
+
+# Values smaller than this are stored uncompressed; zstd wouldn't pay off
+COMPRESS_MIN_BYTES = 256
+
+# Advisory lock key serializing init_db across uvicorn workers
+INIT_LOCK_KEY = 7_231_940_215
+
+# First byte of a stored compressed-column value
+_RAW = b"\x00"
+_ZSTD = b"\x01"
+
+
+def _pack(data: bytes) -> bytes:
+    """
+    Prefix data with a format byte, zstd-compressing it if large enough.
+
+    Args:
+        data (bytes): Serialized value
+
+    Returns:
+        bytes: Value as stored in the database
+    """
+    if len(data) < COMPRESS_MIN_BYTES:
+        return _RAW + data
+    return _ZSTD + zstandard.compress(data, 3)
+
+
+def _unpack(stored: bytes) -> bytes:
+    """
+    Reverse _pack().
+
+    Values without a format byte are rows converted from the old
+    uncompressed columns and are returned unchanged.
+
+    Args:
+        stored (bytes): Value as stored in the database
+
+    Returns:
+        bytes: Serialized value
+    """
+    header = stored[:1]
+    if header == _ZSTD:
+        return zstandard.decompress(stored[1:])
+    if header == _RAW:
+        return stored[1:]
+    return stored
+
+
+class CompressedText(TypeDecorator):
+    """Text stored as bytea, zstd-compressed when large."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Optional[str], dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return _pack(value.encode("utf-8"))
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Optional[str]:
+        if value is None:
+            return None
+        return _unpack(bytes(value)).decode("utf-8")
+
+
+class CompressedJSON(TypeDecorator):
+    """JSON stored as bytea, zstd-compressed when large."""
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        return _pack(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+    def process_result_value(self, value: Optional[bytes], dialect) -> Any:
+        if value is None:
+            return None
+        return json.loads(_unpack(bytes(value)))
+
 
 class Document(Base):
     """
@@ -91,16 +185,49 @@ class Document(Base):
         upload_time (datetime): Timestamp of upload
         status (str): Processing status (processing, completed, failed)
         page_count (int): Number of pages in the PDF
+        content_hash (str): SHA-256 of the file content, used to skip duplicate uploads
         meta (dict): Additional metadata as JSON
     """
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_document_upload_time", "upload_time"),
+        # Serves containment filters such as meta @> '{"author": "X"}'
+        Index("ix_document_meta_gin", "meta", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True)
     filename = Column(String(255), nullable=False)
     upload_time = Column(DateTime, default=datetime.utcnow)
-    status = Column(String(50), default="processing")
+    status = Column(String(50), default="processing", index=True)
     page_count = Column(Integer)
-    meta = Column(JSON)
+    content_hash = Column(String(64), index=True)
+    meta = Column(JsonType)
+
+
+class DocumentChunk(Base):
+    """
+    Text chunk of a document as indexed in the vector database.
+
+    Keeps the chunk text relationally so documents can be re-indexed
+    without re-parsing the PDF. Rows are removed with their document.
+
+    Attributes:
+        id (int): Primary key
+        doc_id (int): Owning document ID
+        chunk_idx (int): Sequential chunk index within the document
+        page (int): Source page number
+        text (str): Chunk text
+    """
+    __tablename__ = "document_chunks"
+    __table_args__ = (
+        Index("ix_documentchunk_doc_chunk", "doc_id", "chunk_idx", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True)
+    doc_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    chunk_idx = Column(Integer, nullable=False)
+    page = Column(Integer)
+    text = Column(Text, nullable=False)
 
 
 class ChatSession(Base):
@@ -112,13 +239,28 @@ class ChatSession(Base):
         session_id (str): Unique session identifier (UUID)
         created_at (datetime): Session creation timestamp
         meta (dict): Additional metadata as JSON
+        messages (List[ChatMessage]): Messages in time order; must be eager-loaded
+            with selectinload(), since lazy loading raises
     """
     __tablename__ = "chat_sessions"
+    __table_args__ = (
+        Index("ix_chatsession_created_at", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True)
     session_id = Column(String(100), unique=True, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
-    meta = Column(JSON)
+    meta = Column(JsonType)
+
+    # Joined on session_id (no FK); read-only since messages are inserted via Core
+    messages = relationship(
+        "ChatMessage",
+        primaryjoin="ChatSession.session_id == foreign(ChatMessage.session_id)",
+        back_populates="session",
+        order_by="ChatMessage.timestamp",
+        lazy="raise",
+        viewonly=True
+    )
 
 
 class ChatMessage(Base):
@@ -133,16 +275,30 @@ class ChatMessage(Base):
         timestamp (datetime): Message timestamp
         sources (dict): Retrieved sources for assistant responses
         meta (dict): Additional metadata as JSON
+        session (ChatSession): Owning session; must be eager-loaded
     """
     __tablename__ = "chat_messages"
+    __table_args__ = (
+        # Serves "messages of a session in time order" without a sort step
+        Index("ix_chatmessage_session_ts", "session_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True)
     session_id = Column(String(100), nullable=False)
     role = Column(String(20), nullable=False)
-    content = Column(Text, nullable=False)
+    # Answers and their source chunks are large and repetitive; zstd shrinks them severalfold
+    content = Column(CompressedText, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    sources = Column(JSON)
-    meta = Column(JSON)
+    sources = Column(CompressedJSON)
+    meta = Column(JsonType)
+
+    session = relationship(
+        "ChatSession",
+        primaryjoin="ChatSession.session_id == foreign(ChatMessage.session_id)",
+        back_populates="messages",
+        lazy="raise",
+        viewonly=True
+    )
 
 
 class QueryMetric(Base):
@@ -160,6 +316,9 @@ class QueryMetric(Base):
         meta (dict): Additional metadata as JSON
     """
     __tablename__ = "query_metrics"
+    __table_args__ = (
+        Index("ix_querymetric_session_ts", "session_id", "timestamp"),
+    )
 
     id = Column(Integer, primary_key=True)
     session_id = Column(String(100))
@@ -168,14 +327,79 @@ class QueryMetric(Base):
     retrieval_count = Column(Integer)
     llm_tokens = Column(Integer)
     timestamp = Column(DateTime, default=datetime.utcnow)
-    meta = Column(JSON)
+    meta = Column(JsonType)
+
+
+class CorpusState(Base):
+    """
+    Single-row table holding the version of the indexed document corpus.
+
+    Answer caches are keyed by this version. Keeping it in the database
+    rather than in memory means every worker sees the same value and a
+    restart never reuses a version whose cached answers predate later
+    uploads.
+
+    Attributes:
+        id (int): Primary key; always 1
+        version (int): Bumped whenever indexed documents change
+    """
+    __tablename__ = "corpus_state"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+def _pool_options() -> dict:
+    """
+    Connection pool settings shared by the sync and async engines.
+
+    Pre-ping discards connections the server closed (e.g. after a restart)
+    and recycling replaces long-lived ones before idle timeouts hit. The
+    checkout timeout bounds how long a request waits on an exhausted pool.
+    Sizes apply per engine in each uvicorn worker process.
+
+    Returns:
+        dict: Keyword arguments for create_engine / create_async_engine
+    """
+    return {
+        "pool_pre_ping": True,
+        "pool_size": cfg.POSTGRES_POOL_SIZE,
+        "max_overflow": cfg.POSTGRES_MAX_OVERFLOW,
+        "pool_recycle": cfg.POSTGRES_POOL_RECYCLE,
+        "pool_timeout": cfg.POSTGRES_POOL_TIMEOUT,
+    }
+
+
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """
+    Return the process-wide sync database engine and its connection pool.
+
+    Returns:
+        Engine: SQLAlchemy engine
+    """
+    return create_engine(cfg.db_url, insertmanyvalues_page_size=1000, **_pool_options())
+
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """
+    Return the process-wide async database engine and its connection pool.
+
+    Returns:
+        AsyncEngine: SQLAlchemy async engine
+    """
+    return create_async_engine(cfg.async_db_url, insertmanyvalues_page_size=1000, **_pool_options())
 
 
 # Create database engine
 try:
-    engine = create_engine(cfg.db_url, pool_pre_ping=True, pool_size=10, max_overflow=20)
-    SessionLocal = sessionmaker(bind=engine)
-    logger.info("Database engine created successfully")
+    engine = get_engine()
+    # Writes flush explicitly and committed objects stay readable without a reload
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+    async_engine = get_async_engine()
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    logger.info("Database engines created successfully")
 except SQLAlchemyError as e:
     logger.error(f"Failed to create database engine: {e}")
     raise
@@ -185,20 +409,227 @@ def init_db() -> None:
     """
     Initialize database by creating all tables.
 
-    Creates all tables defined by SQLAlchemy models if they don't exist.
-    Should be called on application startup.
+    Creates all tables defined by SQLAlchemy models if they don't exist,
+    then adds columns and indexes missing from pre-existing tables
+    (create_all skips tables that already exist).
+    Should be called on application startup. Every step is idempotent and
+    runs under a Postgres advisory lock, so workers starting together
+    apply the DDL one at a time instead of racing.
 
     Raises:
         SQLAlchemyError: If table creation fails
     """
     try:
-        Base.metadata.create_all(engine)
+        with engine.connect() as lock_conn:
+            lock_conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": INIT_LOCK_KEY})
+            try:
+                Base.metadata.create_all(engine)
+                _add_missing_columns()
+                _upgrade_compressed_columns()
+                _upgrade_json_columns()
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.create(engine, checkfirst=True)
+                _seed_corpus_state()
+            finally:
+                lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": INIT_LOCK_KEY})
         logger.info("Database tables initialized successfully")
     except SQLAlchemyError as e:
         logger.error(f"Failed to initialize database tables: {e}")
         raise
 
 
+def _add_missing_columns() -> None:
+    """
+    Add model columns that are missing from existing tables.
+
+    Lightweight stand-in for migrations: new columns are added as
+    nullable with no default, which is how they are declared.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                logger.info(f"Added missing column {table.name}.{column.name}")
+
+
+def _seed_corpus_state() -> None:
+    """Create the corpus_state row if it doesn't exist yet."""
+    with engine.begin() as conn:
+        if conn.execute(select(CorpusState.id).where(CorpusState.id == 1)).first() is None:
+            conn.execute(insert(CorpusState).values(id=1, version=0))
+            logger.info("Created corpus_state row")
+
+
+def _upgrade_compressed_columns() -> None:
+    """
+    Convert text/json columns created by earlier versions to bytea on PostgreSQL.
+
+    Existing values are kept as plain UTF-8 bytes, which the compressed
+    types read back unchanged; new values are written compressed.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"]: c["type"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if not isinstance(column.type, (CompressedText, CompressedJSON)):
+                    continue
+                if isinstance(existing.get(column.name), LargeBinary):
+                    continue
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ALTER COLUMN {column.name} "
+                    f"TYPE bytea USING convert_to({column.name}::text, 'UTF8')"
+                ))
+                logger.info(f"Converted {table.name}.{column.name} to compressed bytea")
+
+
+def _upgrade_json_columns() -> None:
+    """
+    Convert json columns created by earlier versions to jsonb on PostgreSQL.
+
+    Must run before index creation, since GIN indexes need jsonb.
+    """
+    if engine.dialect.name != "postgresql":
+        return
+
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"]: c["type"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.type is not JsonType or isinstance(existing.get(column.name), JSONB):
+                    continue
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ALTER COLUMN {column.name} "
+                    f"TYPE jsonb USING {column.name}::jsonb"
+                ))
+                logger.info(f"Converted {table.name}.{column.name} to jsonb")
+
+
+def bulk_copy_chunks(session: Session, rows: List[tuple]) -> None:
+    """
+    Stream chunk rows into document_chunks with PostgreSQL COPY.
+
+    Runs on the session's own connection, so the rows commit or roll back
+    with the rest of the session's transaction.
+
+    Args:
+        session (Session): Database session
+        rows (List[tuple]): (doc_id, chunk_idx, page, text) tuples
+    """
+    dbapi_conn = session.connection().connection
+    with dbapi_conn.cursor() as cur:
+        with cur.copy("COPY document_chunks (doc_id, chunk_idx, page, text) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(row)
+
+
+def save_chunks(session: Session, doc_id: int, chunks: Dict, start: int = 0) -> None:
+    """
+    Persist a document's chunks, using COPY for large batches.
+
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        session (Session): Database session
+        doc_id (int): Owning document ID
+        chunks (Dict): Columnar chunk batch with 'text' and 'page' columns
+        start (int): chunk_idx of the first chunk, for documents stored in batches
+    """
+    # PostgreSQL text cannot hold NUL bytes, which some PDFs produce
+    rows = [
+        (doc_id, i, page, text.replace("\x00", ""))
+        for i, (text, page) in enumerate(zip(chunks["text"], chunks["page"]), start)
+    ]
+
+    if len(rows) > COPY_THRESHOLD:
+        bulk_copy_chunks(session, rows)
+    else:
+        fast_insert(session, DocumentChunk, [
+            {"doc_id": d, "chunk_idx": i, "page": p, "text": t}
+            for d, i, p, t in rows
+        ])
+    logger.info(f"Stored {len(rows)} chunks for document {doc_id}")
+
+
+def fast_insert(session: Session, model: type, rows: List[Dict]) -> None:
+    """
+    Insert rows with a Core executemany, bypassing the ORM unit of work.
+
+    Skips identity-map bookkeeping, attribute instrumentation and flush
+    events, which dominate the cost of write-only rows such as chat
+    messages and metrics. Python-side column defaults still apply.
+    Does not commit; the caller owns the transaction.
+
+    Args:
+        session (Session): Database session
+        model (type): Mapped model class to insert into
+        rows (List[Dict]): Column values, one dict per row
+
+    Example:
+        fast_insert(db, QueryMetric, [{"session_id": "abc", "query": "Hi"}])
+    """
+    if rows:
+        session.execute(insert(model), rows)
+
+
+async def afast_insert(session: AsyncSession, model: type, rows: List[Dict]) -> None:
+    """
+    Async variant of fast_insert() for AsyncSession.
+
+    Args:
+        session (AsyncSession): Async database session
+        model (type): Mapped model class to insert into
+        rows (List[Dict]): Column values, one dict per row
+    """
+    if rows:
+        await session.execute(insert(model), rows)
+
+
+def bump_corpus_version() -> int:
+    """
+    Atomically increment the shared corpus version.
+
+    Returns:
+        int: The new version
+
+    Raises:
+        SQLAlchemyError: If the update fails
+    """
+    with engine.begin() as conn:
+        return conn.execute(
+            update(CorpusState)
+            .where(CorpusState.id == 1)
+            .values(version=CorpusState.version + 1)
+            .returning(CorpusState.version)
+        ).scalar_one()
+
+
+async def get_corpus_version() -> int:
+    """
+    Read the shared corpus version.
+
+    Returns:
+        int: Current version
+
+    Raises:
+        SQLAlchemyError: If the query fails
+    """
+    async with async_engine.connect() as conn:
+        return (await conn.execute(
+            select(CorpusState.version).where(CorpusState.id == 1)
+        )).scalar_one()
+
+
 def get_db() -> Generator:
     """
     Dependency function for FastAPI to get database sessions.
@@ -222,4 +653,139 @@ def get_db() -> Generator:
         db.rollback()
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function for FastAPI to get async database sessions.
+
+    Async counterpart of get_db() for `async def` endpoints, so database
+    I/O is awaited on the event loop instead of occupying a threadpool slot.
+
+    Yields:
+        AsyncSession: SQLAlchemy async database session
+
+    Example:
+        @app.get("/items")
+        async def get_items(db: AsyncSession = Depends(get_async_db)):
+            return (await db.execute(select(Item))).scalars().all()
+    """
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except SQLAlchemyError as e:
+            logger.error(f"Async database session error: {e}")
+            await db.rollback()
+            raise
+
+class BulkWriter:
+    """
+    Buffers chat messages and query metrics and inserts them in batches.
+
+    Rows are queued in memory and flushed by a background task once
+    batch_size rows are pending or flush_interval seconds have passed,
+    so hot chat traffic costs one multi-row INSERT per table per flush
+    instead of a commit per row. Rows should carry explicit timestamps,
+    since they reach the database after a short delay.
+
+    Attributes:
+        batch_size (int): Maximum rows written per flush
+        flush_interval (float): Maximum seconds a row waits before flushing
+
+    Example:
+        bulk_writer.log_message(session_id="abc", role="user", content="Hi",
+                                timestamp=datetime.utcnow())
+    """
+
+    def __init__(self, batch_size: int = 1000, flush_interval: float = 0.2):
+        """
+        Initialize the writer; call run() on the event loop to start flushing.
+
+        Args:
+            batch_size (int): Maximum rows written per flush (default: 1000)
+            flush_interval (float): Seconds before a partial batch is flushed (default: 0.2)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue()
+
+    def log_message(self, **row) -> None:
+        """
+        Queue a ChatMessage row for insertion.
+
+        Args:
+            **row: ChatMessage column values
+        """
+        self._queue.put_nowait((ChatMessage, row))
+
+    def log_metric(self, **row) -> None:
+        """
+        Queue a QueryMetric row for insertion.
+
+        Args:
+            **row: QueryMetric column values
+        """
+        self._queue.put_nowait((QueryMetric, row))
+
+    async def run(self) -> None:
+        """
+        Flush queued rows until cancelled, then write whatever is left.
+
+        Intended to run as a background task for the lifetime of the app.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.flush_interval
+
+                while len(batch) < self.batch_size:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                await self._flush(batch)
+        except asyncio.CancelledError:
+            await self.drain()
+            raise
+
+    async def drain(self) -> None:
+        """Flush every row still queued, e.g. on shutdown."""
+        while not self._queue.empty():
+            batch = []
+            while not self._queue.empty() and len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[tuple]) -> None:
+        """
+        Insert one batch, one executemany per table, in a single transaction.
+
+        Failures are logged and the batch is dropped, so one bad flush never
+        stops the writer.
+
+        Args:
+            batch (List[tuple]): (model, row) pairs taken from the queue
+        """
+        by_model: Dict[type, List[Dict]] = {}
+        for model, row in batch:
+            by_model.setdefault(model, []).append(row)
+
+        try:
+            async with AsyncSessionLocal() as session, session.begin():
+                # Messages first so an exchange and its metric land in order
+                for model in (ChatMessage, QueryMetric):
+                    await afast_insert(session, model, by_model.get(model, []))
+            logger.debug("Flushed %s buffered rows", len(batch))
+        except Exception as e:
+            # Connection errors (e.g. Postgres restarting) must not end the
+            # writer loop; the batch is dropped and later rows still flush
+            logger.error(f"Failed to flush {len(batch)} buffered rows: {e}")
+
+
+bulk_writer = BulkWriter(cfg.BULK_WRITE_BATCH_SIZE, cfg.BULK_WRITE_INTERVAL)
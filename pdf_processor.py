@@ -45,17 +45,115 @@ a word-based chunking strategy with configurable overlap for optimal RAG
 performance.
 """
 
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import diskcache
 import fitz
-from typing import List, Dict, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
+import hashlib
 import logging
-from pathlib import Path
+import multiprocessing
+import re
 
 from config import cfg
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Read size when hashing PDFs for the extraction cache
+HASH_BLOCK_BYTES = 1 << 20
+
+# Smallest page range worth shipping to another process
+PAGES_PER_WORKER = 32
+
+WORD_RE = re.compile(r"\S+")
+
+# Bump when extraction or chunking output changes, to invalidate the cache
+CHUNK_FORMAT_VERSION = 4
+
+# Chunks per batch handed to the indexer and per extraction cache entry
+CHUNK_BATCH_SIZE = 256
+
+# Plain-text extraction, rejoining words hyphenated across line breaks
+TEXT_FLAGS = fitz.TEXTFLAGS_TEXT | fitz.TEXT_DEHYPHENATE
+
+
+def file_sha256(path: str) -> str:
+    """
+    Compute the SHA-256 of a file, reading it in 1 MB blocks.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        str: Hex digest of the file content
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(HASH_BLOCK_BYTES):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_range(pdf_path: str, start: int, stop: int) -> List[Dict[str, any]]:
+    """
+    Extract text from pages [start, stop) of a PDF.
+
+    Opens its own document handle, so it can run in a worker process.
+
+    Args:
+        pdf_path (str): Path to the PDF file
+        start (int): First page index (0-based, inclusive)
+        stop (int): Last page index (0-based, exclusive)
+
+    Returns:
+        List[Dict]: Page dictionaries with text and 1-based page numbers
+    """
+    with fitz.open(pdf_path) as doc:
+        return list(_iter_pages(doc, start, stop))
+
+
+def _iter_pages(doc: fitz.Document, start: int, stop: int) -> Iterator[Dict[str, any]]:
+    """
+    Extract text from pages [start, stop) of an open document, one at a time.
+
+    Args:
+        doc (fitz.Document): Open PDF document
+        start (int): First page index (0-based, inclusive)
+        stop (int): Last page index (0-based, exclusive)
+
+    Yields:
+        Dict: Page dictionary with text and 1-based page number
+    """
+    for i in range(start, stop):
+        try:
+            text = doc.load_page(i).get_text("text", flags=TEXT_FLAGS)
+        except Exception as e:
+            logger.warning("Failed to extract text from page %s: %s", i + 1, e)
+            text = ""
+        yield {"page": i + 1, "text": text}
+
+
+@lru_cache(maxsize=1)
+def _get_extract_pool() -> ProcessPoolExecutor:
+    """
+    Return the process pool used to extract large PDFs, creating it on first use.
+
+    PyMuPDF is not thread-safe, so pages are split across processes rather
+    than threads. Workers are spawned, not forked, since the API process
+    runs threads.
+
+    Returns:
+        ProcessPoolExecutor: Shared extraction pool
+    """
+    return ProcessPoolExecutor(
+        max_workers=cfg.PDF_EXTRACT_WORKERS,
+        mp_context=multiprocessing.get_context("spawn")
+    )
+
 
 class PDFProcessor:
     """
@@ -63,19 +161,24 @@ class PDFProcessor:
 
     Uses PyMuPDF (fitz) for fast and accurate text extraction. Implements
     word-based chunking with overlap to maintain context across chunks.
+    Chunk batches are cached on disk by content hash, so the same PDF is
+    only extracted once per chunking configuration.
 
     Attributes:
         chunk_size (int): Number of words per chunk
         overlap (int): Number of overlapping words between consecutive chunks
+        cache (diskcache.Cache): On-disk cache of chunk batches and their
+            (batch_count, page_count) totals
     """
 
-    def __init__(self, chunk_size: int = None, overlap: int = None):
+    def __init__(self, chunk_size: int = None, overlap: int = None, cache_dir: str = None):
         """
         Initialize PDF processor with chunking parameters.
 
         Args:
             chunk_size (int, optional): Words per chunk. Defaults to config value.
             overlap (int, optional): Overlapping words. Defaults to config value.
+            cache_dir (str, optional): Extraction cache directory. Defaults to config value.
 
         Raises:
             ValueError: If overlap >= chunk_size
@@ -88,12 +191,66 @@ class PDFProcessor:
                 f"Overlap ({self.overlap}) must be less than chunk_size ({self.chunk_size})"
             )
 
+        self.cache = diskcache.Cache(cache_dir or cfg.PDF_CACHE_DIR)
+
         logger.info(f"PDFProcessor initialized: chunk_size={self.chunk_size}, overlap={self.overlap}")
 
+    def iter_pages(self, pdf_path: str) -> Iterator[Dict[str, any]]:
+        """
+        Yield the text of a PDF page by page, in page order.
+
+        Small PDFs are read one page at a time from a single document
+        handle. Large PDFs are split into page ranges extracted in parallel
+        by a process pool, and each range is yielded as it completes.
+
+        Args:
+            pdf_path (str): Path to the PDF file
+
+        Yields:
+            Dict: Page dictionary with text and 1-based page number
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            Exception: If PDF cannot be opened or read
+        """
+        try:
+            doc = fitz.open(pdf_path)
+        except (FileNotFoundError, fitz.FileNotFoundError):
+            # PyMuPDF raises its own FileNotFoundError, a RuntimeError subclass
+            logger.error(f"PDF file not found: {pdf_path}")
+            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
+        except Exception as e:
+            logger.error(f"Failed to open PDF {pdf_path}: {e}")
+            raise Exception(f"Failed to process PDF: {str(e)}")
+
+        try:
+            with doc:
+                page_count = doc.page_count
+                workers = min(cfg.PDF_EXTRACT_WORKERS, page_count // PAGES_PER_WORKER)
+                if workers < 2:
+                    yield from _iter_pages(doc, 0, page_count)
+
+            if workers >= 2:
+                step = -(-page_count // workers)
+                starts = range(0, page_count, step)
+                stops = [min(s + step, page_count) for s in starts]
+                for part in _get_extract_pool().map(
+                        _extract_range, [pdf_path] * len(starts), starts, stops
+                ):
+                    yield from part
+
+            logger.info(f"Extracted text from {page_count} pages in {pdf_path}")
+
+        except Exception as e:
+            logger.error(f"Failed to read PDF {pdf_path}: {e}")
+            raise Exception(f"Failed to process PDF: {str(e)}")
+
     def extract_text(self, pdf_path: str) -> Tuple[List[Dict[str, any]], int]:
         """
         Extract text from PDF file page by page.
 
+        Materializes iter_pages() for callers that need every page at once.
+
         Args:
             pdf_path (str): Path to the PDF file
 
@@ -109,39 +266,58 @@ class PDFProcessor:
             pages, count = processor.extract_text("document.pdf")
             # pages = [{"page": 1, "text": "..."}, {"page": 2, "text": "..."}]
         """
-        # Validate file exists
-        if not Path(pdf_path).exists():
-            logger.error(f"PDF file not found: {pdf_path}")
-            raise FileNotFoundError(f"PDF file not found: {pdf_path}")
-
-        try:
-            doc = fitz.open(pdf_path)
-            pages = []
+        pages = list(self.iter_pages(pdf_path))
+        return pages, len(pages)
 
-            for i, page in enumerate(doc):
-                try:
-                    text = page.get_text()
-                    pages.append({"page": i + 1, "text": text})
-                except Exception as e:
-                    logger.warning(f"Failed to extract text from page {i + 1}: {e}")
-                    pages.append({"page": i + 1, "text": ""})
+    def _chunk_page(self, page_data: Dict[str, any]) -> Iterator[Dict[str, any]]:
+        """
+        Chunk one page using a word-based sliding window with overlap.
 
-            page_count = len(doc)
-            doc.close()
+        Each chunk is a single slice of the page text between word offsets,
+        so original spacing inside a chunk is kept.
 
-            logger.info(f"Extracted text from {page_count} pages in {pdf_path}")
-            return pages, page_count
+        Args:
+            page_data (Dict): Page dictionary with text and page number
 
-        except Exception as e:
-            logger.error(f"Failed to open PDF {pdf_path}: {e}")
-            raise Exception(f"Failed to process PDF: {str(e)}")
+        Yields:
+            Dict: Chunk dictionary with text and page number
+        """
+        text = page_data["text"]
+        page_num = page_data["page"]
+
+        # Skip empty pages
+        if not text.strip():
+            logger.debug("Skipping empty page %s", page_num)
+            return
+
+        # Word boundaries as character offsets
+        starts, ends = [], []
+        for match in WORD_RE.finditer(text):
+            starts.append(match.start())
+            ends.append(match.end())
+
+        # Short page: the whole page is the only chunk
+        if len(starts) <= self.chunk_size:
+            yield {"text": text[starts[0]:ends[-1]], "page": page_num}
+            return
+
+        # Create overlapping chunks, stopping once a window reaches the end;
+        # any later window would only repeat that chunk's tail
+        for i in range(0, len(starts), self.chunk_size - self.overlap):
+            last = min(i + self.chunk_size, len(ends)) - 1
+            yield {
+                "text": text[starts[i]:ends[last]],
+                "page": page_num
+            }
+            if last == len(ends) - 1:
+                break
 
     def chunk_text(self, pages: List[Dict[str, any]]) -> List[Dict[str, any]]:
         """
         Chunk extracted text using word-based sliding window with overlap.
 
         Splits text into overlapping chunks to maintain context. Empty pages
-        and chunks are filtered out.
+        are skipped.
 
         Args:
             pages (List[Dict]): List of page dictionaries from extract_text()
@@ -153,44 +329,100 @@ class PDFProcessor:
             chunks = processor.chunk_text(pages)
             # chunks = [{"text": "...", "page": 1}, {"text": "...", "page": 1}, ...]
         """
-        chunks = []
+        chunks = [chunk for page_data in pages for chunk in self._chunk_page(page_data)]
 
-        for page_data in pages:
-            text = page_data["text"]
-            page_num = page_data["page"]
+        logger.info(f"Created {len(chunks)} chunks from {len(pages)} pages")
+        return chunks
 
-            # Skip empty pages
-            if not text.strip():
-                logger.debug(f"Skipping empty page {page_num}")
-                continue
+    def _cache_key(self, content_hash: str) -> str:
+        """
+        Build the extraction cache key for a PDF.
 
-            # Split into words
-            words = text.split()
+        Includes the chunking parameters and CHUNK_FORMAT_VERSION so
+        changing either invalidates previously cached results.
 
-            # Create overlapping chunks
-            for i in range(0, len(words), self.chunk_size - self.overlap):
-                chunk_words = words[i:i + self.chunk_size]
-                chunk_text = " ".join(chunk_words)
+        Args:
+            content_hash (str): SHA-256 of the PDF content
 
-                # Only add non-empty chunks
-                if chunk_text.strip():
-                    chunks.append({
-                        "text": chunk_text,
-                        "page": page_num
-                    })
+        Returns:
+            str: Cache key
+        """
+        return f"{content_hash}:{self.chunk_size}:{self.overlap}:{CHUNK_BATCH_SIZE}:v{CHUNK_FORMAT_VERSION}"
 
-        logger.info(f"Created {len(chunks)} chunks from {len(pages)} pages")
-        return chunks
+    def iter_chunk_batches(
+            self,
+            pdf_path: str,
+            content_hash: Optional[str] = None
+    ) -> Iterator[Tuple[Dict[str, any], int]]:
+        """
+        Yield a PDF's chunks in batches of CHUNK_BATCH_SIZE, in order.
 
-    def process(self, pdf_path: str) -> Tuple[List[Dict[str, any]], int]:
+        Pages are chunked as they are extracted and each batch is written
+        to the extraction cache as its own entry, so only one batch and one
+        page are held at a time. The totals entry is written last, and a
+        cache hit replays the batches one by one without opening the PDF.
+        Batches are columnar: the text list goes to the embedding model
+        as-is and page numbers are a compact int32 array, so no dict is
+        built per chunk.
+
+        Args:
+            pdf_path (str): Path to the PDF file
+            content_hash (str, optional): SHA-256 of the file, if already known.
+                                          Computed from the file otherwise.
+
+        Yields:
+            Tuple[Dict, int]: Chunk batch with "text" (List[str]) and "page"
+                (array of int32) columns, and the number of pages read so
+                far. The last batch, which may be empty, carries the page
+                count of the whole document.
+
+        Raises:
+            FileNotFoundError: If PDF file doesn't exist
+            Exception: If PDF cannot be opened or read
+
+        Example:
+            for batch, pages_read in processor.iter_chunk_batches("document.pdf"):
+                vectors = model.encode(batch["text"])
+        """
+        key = self._cache_key(content_hash or file_sha256(pdf_path))
+        totals = self.cache.get(key)
+        # A batch evicted on its own turns the whole entry into a miss
+        if totals is not None and all(f"{key}:{n}" in self.cache for n in range(totals[0])):
+            logger.info(f"Extraction cache hit for {pdf_path}")
+            batch_count, page_count = totals
+            for n in range(batch_count):
+                yield self.cache[f"{key}:{n}"], page_count
+            return
+
+        batch = {"text": [], "page": array("i")}
+        batch_count = 0
+        page_count = 0
+        for page_data in self.iter_pages(pdf_path):
+            page_count += 1
+            for chunk in self._chunk_page(page_data):
+                batch["text"].append(chunk["text"])
+                batch["page"].append(chunk["page"])
+                if len(batch["text"]) == CHUNK_BATCH_SIZE:
+                    self.cache.set(f"{key}:{batch_count}", batch)
+                    batch_count += 1
+                    yield batch, page_count
+                    batch = {"text": [], "page": array("i")}
+
+        self.cache.set(f"{key}:{batch_count}", batch)
+        self.cache.set(key, (batch_count + 1, page_count))
+        yield batch, page_count
+
+    def process(self, pdf_path: str, content_hash: Optional[str] = None) -> Tuple[List[Dict[str, any]], int]:
         """
         Complete PDF processing pipeline: extract and chunk text.
 
-        Convenience method that combines extract_text() and chunk_text()
-        into a single operation.
+        Materializes iter_chunk_batches() for callers that need every chunk
+        at once; ingestion consumes the batches directly instead.
 
         Args:
             pdf_path (str): Path to the PDF file
+            content_hash (str, optional): SHA-256 of the file, if already known.
+                                          Computed from the file otherwise.
 
         Returns:
             Tuple[List[Dict], int]: List of text chunks and page count
@@ -203,8 +435,10 @@ class PDFProcessor:
             chunks, page_count = processor.process("document.pdf")
         """
         try:
-            pages, page_count = self.extract_text(pdf_path)
-            chunks = self.chunk_text(pages)
+            chunks = []
+            page_count = 0
+            for batch, page_count in self.iter_chunk_batches(pdf_path, content_hash):
+                chunks.extend({"text": t, "page": p} for t, p in zip(batch["text"], batch["page"]))
 
             logger.info(f"Successfully processed {pdf_path}: {len(chunks)} chunks from {page_count} pages")
             return chunks, page_count
@@ -51,15 +51,18 @@ with Google Gemini LLM to generate contextual answers with citations.
 """
 
 import google.generativeai as genai
-from typing import Dict, List, Optional
+from cachetools import TTLCache
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import hashlib
 import time
 import logging
 
 from config import cfg
-from vector_db import vdb
+from db import bump_corpus_version, get_corpus_version
+from vector_db import VectorDB, get_vdb
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Configure Gemini API
@@ -70,6 +73,43 @@ except Exception as e:
     logger.error(f"Failed to configure Gemini API: {e}")
     raise
 
+# One retrieved chunk in the prompt context
+SOURCE_TEMPLATE = "[Source {} - Doc: {}, Page: {}]\n{}\n"
+
+# Static prompt; only the context and query vary per request
+PROMPT_TEMPLATE = """You are a helpful AI assistant that answers questions based on the provided context from PDF documents.
+
+Instructions:
+1. Answer the question using ONLY information from the context below
+2. Include citations with document name and page number in your answer
+3. If the context doesn't contain relevant information, say so clearly
+4. Be concise but comprehensive
+5. Format citations as: (Document Name, Page X)
+
+Context:
+{context}
+
+Question: {query}
+
+Answer with citations:"""
+
+
+@lru_cache(maxsize=4)
+def _get_model(model_name: str) -> genai.GenerativeModel:
+    """
+    Return a shared Gemini model client for the given model name.
+
+    Engines using the same model reuse one client instead of building
+    a new one each time.
+
+    Args:
+        model_name (str): Name of the Gemini model
+
+    Returns:
+        GenerativeModel: Gemini model client
+    """
+    return genai.GenerativeModel(model_name)
+
 
 class RAGEngine:
     """
@@ -80,25 +120,92 @@ class RAGEngine:
 
     Attributes:
         model (GenerativeModel): Google Gemini generative model instance
+        vdb (VectorDB): Vector database used for retrieval and the semantic cache
+        answer_cache (TTLCache): Exact-match cache of generated responses,
+            keyed by the corpus version shared through the database
+        version_cache (TTLCache): Briefly cached corpus version, so queries
+            don't each need a database round trip
     """
 
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
+    def __init__(self, model_name: str = "gemini-2.5-flash", vdb: Optional[VectorDB] = None):
         """
         Initialize RAG engine with specified Gemini model.
 
         Args:
             model_name (str): Name of the Gemini model to use
+            vdb (VectorDB, optional): Vector database to use. Defaults to the shared instance.
 
         Raises:
             Exception: If model initialization fails
         """
         try:
-            self.model = genai.GenerativeModel(model_name)
+            self.model = _get_model(model_name)
             logger.info(f"Initialized RAG engine with model: {model_name}")
         except Exception as e:
             logger.error(f"Failed to initialize Gemini model: {e}")
             raise Exception(f"Model initialization failed: {str(e)}")
 
+        self.vdb = vdb or get_vdb()
+        self.answer_cache = TTLCache(maxsize=cfg.ANSWER_CACHE_SIZE, ttl=cfg.ANSWER_CACHE_TTL)
+        self.version_cache = TTLCache(maxsize=1, ttl=cfg.CORPUS_VERSION_TTL)
+
+    def invalidate_cache(self) -> None:
+        """
+        Invalidate cached answers after the document corpus changes.
+
+        Bumps the corpus version that is part of every cache key, so entries
+        computed against the old corpus are never served again and simply
+        age out of the in-process cache. The version lives in the database,
+        so it survives restarts and other workers pick up the bump within
+        CORPUS_VERSION_TTL. Stale semantic cache entries are deleted from
+        Qdrant.
+        """
+        version = bump_corpus_version()
+        self.version_cache["version"] = version
+        self.vdb.cache_clear(version)
+        logger.info(f"Answer cache invalidated (corpus version {version})")
+
+    async def _acorpus_version(self) -> int:
+        """
+        Return the shared corpus version, re-reading it once CORPUS_VERSION_TTL expires.
+
+        Returns:
+            int: Current corpus version
+        """
+        version = self.version_cache.get("version")
+        if version is None:
+            version = await get_corpus_version()
+            self.version_cache["version"] = version
+        return version
+
+    def _cache_key(
+            self,
+            query: str,
+            top_k: int,
+            doc_filter: Optional[int],
+            only_if_sources: bool,
+            corpus_version: int
+    ) -> str:
+        """
+        Build the exact-match cache key for a query.
+
+        The query is lower-cased and whitespace-normalized so trivially
+        different spellings of the same question share an entry.
+
+        Args:
+            query (str): User's question
+            top_k (int): Number of chunks to retrieve
+            doc_filter (int, optional): Document ID filter
+            only_if_sources (bool): Only-answer-if-sources flag
+            corpus_version (int): Corpus version the answer belongs to
+
+        Returns:
+            str: SHA-256 hex digest identifying the request
+        """
+        normalized = " ".join(query.lower().split())
+        raw = f"{normalized}|{top_k}|{doc_filter}|{only_if_sources}|{corpus_version}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
     def _build_context(self, results: List[Dict]) -> str:
         """
         Build context string from search results.
@@ -115,19 +222,16 @@ class RAGEngine:
         if not results:
             return "No relevant context found."
 
-        context_parts = []
-        for i, r in enumerate(results, 1):
-            context_parts.append(
-                f"[Source {i} - Doc: {r['filename']}, Page: {r['page']}]\n{r['text']}\n"
-            )
-
-        return "\n".join(context_parts)
+        return "\n".join(
+            SOURCE_TEMPLATE.format(i, r["filename"], r["page"], r["text"])
+            for i, r in enumerate(results, 1)
+        )
 
     def _build_prompt(self, query: str, context: str) -> str:
         """
         Build the prompt for the LLM.
 
-        Creates a structured prompt that instructs the model to answer
+        Fills PROMPT_TEMPLATE, which instructs the model to answer
         based on provided context with proper citations.
 
         Args:
@@ -137,42 +241,36 @@ class RAGEngine:
         Returns:
             str: Complete prompt for the LLM
         """
-        prompt = f"""You are a helpful AI assistant that answers questions based on the provided context from PDF documents.
+        return PROMPT_TEMPLATE.format(context=context, query=query)
 
-Instructions:
-1. Answer the question using ONLY information from the context below
-2. Include citations with document name and page number in your answer
-3. If the context doesn't contain relevant information, say so clearly
-4. Be concise but comprehensive
-5. Format citations as: (Document Name, Page X)
-
-Context:
-{context}
-
-Question: {query}
-
-Answer with citations:"""
-
-        return prompt
-
-    def generate_answer(
+    async def agenerate_answer(
             self,
             query: str,
             top_k: int = 5,
             doc_filter: Optional[int] = None,
-            only_if_sources: bool = False
+            only_if_sources: bool = False,
+            query_vector: Optional[List[float]] = None,
+            results: Optional[List[Dict]] = None
     ) -> Dict:
         """
         Generate an answer to a query using RAG pipeline.
 
         Retrieves relevant document chunks and uses Gemini to generate
-        a contextual answer with citations. Tracks performance metrics.
+        a contextual answer with citations. Embedding runs in a worker
+        thread and the Qdrant and Gemini calls are awaited, so the event
+        loop can serve other requests meanwhile. Successful responses are
+        kept in an exact-match TTL cache and a semantic cache of query
+        embeddings, so repeated or paraphrased questions skip retrieval
+        and generation entirely.
 
         Args:
             query (str): User's question
             top_k (int): Number of chunks to retrieve (default: 5)
             doc_filter (int, optional): Filter results by document ID
             only_if_sources (bool): Return error if no sources found (default: False)
+            query_vector (List[float], optional): Precomputed query embedding
+            results (List[Dict], optional): Precomputed retrieval results;
+                requires query_vector
 
         Returns:
             Dict: Response containing:
@@ -180,15 +278,14 @@ Answer with citations:"""
                 - sources (List[Dict]): Retrieved source chunks
                 - response_time (float): Total processing time in seconds
                 - retrieval_count (int): Number of chunks retrieved
+                - cache_hit (bool): Whether the answer came from a cache
 
         Raises:
             ValueError: If query is empty
-            Exception: If generation fails
 
         Example:
-            response = rag.generate_answer("What is machine learning?", top_k=3)
+            response = await rag.agenerate_answer("What is machine learning?", top_k=3)
             print(response['answer'])
-            print(f"Found {response['retrieval_count']} sources")
         """
         if not query or not query.strip():
             logger.warning("Empty query received")
@@ -197,59 +294,349 @@ Answer with citations:"""
         start_time = time.time()
 
         try:
-            # Retrieve relevant chunks
-            logger.info(f"Searching for query: '{query[:50]}...' with top_k={top_k}")
-            results = vdb.search(query, top_k, doc_filter)
-
-            # Handle no results case
-            if only_if_sources and not results:
-                response_time = time.time() - start_time
-                logger.info("No sources found and only_if_sources=True")
-                return {
-                    "answer": "No relevant sources found for your query. Please try rephrasing or check if documents are uploaded.",
-                    "sources": [],
-                    "response_time": response_time,
-                    "retrieval_count": 0
-                }
-
-            # Build context and prompt
-            context = self._build_context(results)
-            prompt = self._build_prompt(query, context)
-
-            # Generate answer using Gemini
-            logger.info(f"Generating answer with {len(results)} sources")
-            response = self.model.generate_content(prompt)
-            answer = response.text
-
-            response_time = time.time() - start_time
-
-            logger.info(
-                f"Generated answer in {response_time:.2f}s with {len(results)} sources"
+            ready, state = await self._aprepare(
+                query, top_k, doc_filter, only_if_sources, start_time, query_vector, results
             )
+            if ready is not None:
+                return ready
 
-            return {
-                "answer": answer,
-                "sources": results,
-                "response_time": response_time,
-                "retrieval_count": len(results)
-            }
+            logger.info("Generating answer with %s sources", len(state['results']))
+            response = await self.model.generate_content_async(state["prompt"])
+
+            return await self._afinish(state, response.text, start_time)
 
         except ValueError as e:
             logger.error(f"Validation error: {e}")
             raise
         except Exception as e:
-            response_time = time.time() - start_time
-            logger.error(f"Answer generation failed after {response_time:.2f}s: {e}")
+            return self._error_result(e, start_time)
 
-            # Return graceful error response
-            return {
-                "answer": f"I encountered an error while generating the answer: {str(e)}. Please try again.",
-                "sources": [],
-                "response_time": response_time,
-                "retrieval_count": 0
-            }
+    async def agenerate_answers(
+            self,
+            queries: List[str],
+            top_k: int = 5,
+            doc_filter: Optional[int] = None,
+            only_if_sources: bool = False
+    ) -> List[Dict]:
+        """
+        Answer several queries concurrently.
+
+        All queries are embedded in one model call and retrieved in one
+        batched vector search; each then runs through agenerate_answer()
+        with its Gemini call overlapping the others, bounded only by the
+        API quota.
+
+        Args:
+            queries (List[str]): User questions
+            top_k (int): Number of chunks to retrieve per query (default: 5)
+            doc_filter (int, optional): Filter results by document ID
+            only_if_sources (bool): Return error if no sources found (default: False)
+
+        Returns:
+            List[Dict]: One response per query, in input order
+
+        Raises:
+            ValueError: If any query is empty
+        """
+        if any(not q or not q.strip() for q in queries):
+            logger.warning("Empty query received")
+            raise ValueError("Query cannot be empty")
+
+        vectors = await self.vdb.aembed_batch(queries)
+        batch_results = await self.vdb.asearch_batch(vectors, top_k, doc_filter)
 
+        return await asyncio.gather(*[
+            self.agenerate_answer(q, top_k, doc_filter, only_if_sources, vec, results)
+            for q, vec, results in zip(queries, vectors, batch_results)
+        ])
 
-# Global RAG engine instance
-rag = RAGEngine()
+    async def stream_answer(
+            self,
+            query: str,
+            top_k: int = 5,
+            doc_filter: Optional[int] = None,
+            only_if_sources: bool = False
+    ) -> AsyncIterator[Dict]:
+        """
+        Stream an answer as it is generated.
+
+        Same pipeline and caches as agenerate_answer(), but yields the
+        answer text incrementally so clients can render tokens as Gemini
+        produces them. Cached and no-source answers arrive as one delta.
+
+        Args:
+            query (str): User's question
+            top_k (int): Number of chunks to retrieve (default: 5)
+            doc_filter (int, optional): Filter results by document ID
+            only_if_sources (bool): Return error if no sources found (default: False)
+
+        Yields:
+            Dict: {"delta": str} events, then one final event with
+                  done=True, sources, response_time, retrieval_count,
+                  cache_hit and failed
+
+        Raises:
+            ValueError: If query is empty
+        """
+        if not query or not query.strip():
+            logger.warning("Empty query received")
+            raise ValueError("Query cannot be empty")
+
+        start_time = time.time()
+
+        try:
+            ready, state = await self._aprepare(query, top_k, doc_filter, only_if_sources, start_time)
+            if ready is None:
+                logger.info("Streaming answer with %s sources", len(state['results']))
+                response = await self.model.generate_content_async(state["prompt"], stream=True)
+
+                parts = []
+                async for chunk in response:
+                    parts.append(chunk.text)
+                    yield {"delta": chunk.text}
+
+                result = await self._afinish(state, "".join(parts), start_time)
+            else:
+                result = ready
+                yield {"delta": result["answer"]}
+
+        except Exception as e:
+            result = self._error_result(e, start_time)
+            yield {"delta": result["answer"]}
+
+        yield {
+            "done": True,
+            "sources": result["sources"],
+            "response_time": result["response_time"],
+            "retrieval_count": result["retrieval_count"],
+            "cache_hit": result["cache_hit"],
+            "failed": result.get("failed", False)
+        }
+
+    async def _aprepare(
+            self,
+            query: str,
+            top_k: int,
+            doc_filter: Optional[int],
+            only_if_sources: bool,
+            start_time: float,
+            query_vector: Optional[List[float]] = None,
+            results: Optional[List[Dict]] = None
+    ) -> Tuple[Optional[Dict], Dict]:
+        """
+        Resolve a query from the caches or retrieve context for generation.
+
+        Args:
+            query (str): User's question
+            top_k (int): Number of chunks to retrieve
+            doc_filter (int, optional): Filter results by document ID
+            only_if_sources (bool): Return early if no sources found
+            start_time (float): Query start timestamp
+            query_vector (List[float], optional): Precomputed query embedding
+            results (List[Dict], optional): Precomputed retrieval results
+
+        Returns:
+            Tuple[Optional[Dict], Dict]: A finished response when the query
+                needs no generation (cache hit, no sources) else None, and
+                the state needed to generate and cache the answer
+        """
+        corpus_version = await self._acorpus_version()
+        state = {
+            "cache_key": self._cache_key(query, top_k, doc_filter, only_if_sources, corpus_version),
+            "scope": f"{top_k}|{doc_filter}|{only_if_sources}",
+            "corpus_version": corpus_version
+        }
+
+        cached = self.answer_cache.get(state["cache_key"])
+        if cached is not None:
+            logger.info("Answer cache hit for query: '%s...'", query[:50])
+            return {**cached, "response_time": time.time() - start_time, "cache_hit": True}, state
+
+        # Embed once; the vector serves both the semantic cache and retrieval
+        if query_vector is None:
+            query_vector = await self.vdb.aembed(query)
+        state["query_vector"] = query_vector
+
+        lookup = self.semantic_cache_lookup(
+            state["query_vector"], state["scope"], state["corpus_version"]
+        )
+        if results is None:
+            # Retrieve while the semantic cache is checked; on a miss the search
+            # latency is already paid, on a hit its result is simply dropped
+            logger.info("Searching for query: '%s...' with top_k=%s", query[:50], top_k)
+            cached, results = await asyncio.gather(
+                lookup,
+                self.vdb.asearch(query, top_k, doc_filter, state["query_vector"])
+            )
+        else:
+            cached = await lookup
+        if cached is not None:
+            logger.info("Semantic cache hit for query: '%s...'", query[:50])
+            result = {**cached, "response_time": time.time() - start_time, "cache_hit": True}
+            self.answer_cache[state["cache_key"]] = result
+            return result, state
+
+        if only_if_sources and not results:
+            result = self._no_sources_result(start_time)
+            self.answer_cache[state["cache_key"]] = result
+            return result, state
+
+        state["results"] = results
+        state["prompt"] = self._build_prompt(query, self._build_context(results))
+        return None, state
+
+    async def _afinish(self, state: Dict, answer: str, start_time: float) -> Dict:
+        """
+        Build the response for a generated answer and store it in both caches.
+
+        Args:
+            state (Dict): State returned by _aprepare()
+            answer (str): Generated answer text
+            start_time (float): Query start timestamp
+
+        Returns:
+            Dict: Response with answer, sources, response_time and retrieval_count
+        """
+        results = state["results"]
+        response_time = time.time() - start_time
+
+        logger.info(
+            "Generated answer in %.2fs with %s sources", response_time, len(results)
+        )
+
+        result = {
+            "answer": answer,
+            "sources": results,
+            "response_time": response_time,
+            "retrieval_count": len(results),
+            "cache_hit": False
+        }
+        self.answer_cache[state["cache_key"]] = result
+        await self.vdb.acache_store(
+            state["query_vector"],
+            self._cache_payload(answer, results, state["scope"], state["corpus_version"])
+        )
+        return result
+
+    async def semantic_cache_lookup(
+            self,
+            query_vector: List[float],
+            scope: str,
+            corpus_version: int
+    ) -> Optional[Dict]:
+        """
+        Look up an answer to a semantically equivalent earlier query.
+
+        Args:
+            query_vector (List[float]): Embedding of the incoming query
+            scope (str): Encoded retrieval parameters (top_k, doc_filter, only_if_sources)
+            corpus_version (int): Corpus version the answer must belong to
+
+        Returns:
+            Optional[Dict]: Cached answer, sources and retrieval_count, or None
+        """
+        payload = await self.vdb.acache_lookup(
+            query_vector,
+            scope,
+            corpus_version,
+            cfg.SEMANTIC_CACHE_THRESHOLD
+        )
+        if payload is None:
+            return None
+
+        return self._payload_result(payload)
+
+    def _cache_payload(self, answer: str, results: List[Dict], scope: str, corpus_version: int) -> Dict:
+        """
+        Build the semantic cache entry for a generated answer.
+
+        Args:
+            answer (str): Generated answer text
+            results (List[Dict]): Sources the answer was generated from
+            scope (str): Encoded retrieval parameters
+            corpus_version (int): Corpus version the answer belongs to
+
+        Returns:
+            Dict: Payload for vdb.acache_store()
+        """
+        return {
+            "answer": answer,
+            "sources": results,
+            "retrieval_count": len(results),
+            "scope": scope,
+            "corpus_version": corpus_version
+        }
+
+    def _payload_result(self, payload: Dict) -> Dict:
+        """
+        Extract the response fields from a semantic cache entry.
+
+        Args:
+            payload (Dict): Payload returned by vdb.acache_lookup()
+
+        Returns:
+            Dict: Cached answer, sources and retrieval_count
+        """
+        return {
+            "answer": payload["answer"],
+            "sources": payload["sources"],
+            "retrieval_count": payload["retrieval_count"]
+        }
+
+    def _no_sources_result(self, start_time: float) -> Dict:
+        """
+        Build the response returned when only_if_sources is set and nothing matched.
+
+        Args:
+            start_time (float): Query start timestamp
+
+        Returns:
+            Dict: Response with explanatory answer and no sources
+        """
+        logger.info("No sources found and only_if_sources=True")
+        return {
+            "answer": "No relevant sources found for your query. Please try rephrasing or check if documents are uploaded.",
+            "sources": [],
+            "response_time": time.time() - start_time,
+            "retrieval_count": 0,
+            "cache_hit": False
+        }
+
+    def _error_result(self, error: Exception, start_time: float) -> Dict:
+        """
+        Build a graceful error response when answer generation fails.
+
+        Args:
+            error (Exception): The failure that occurred
+            start_time (float): Query start timestamp
+
+        Returns:
+            Dict: Response carrying the error message and no sources,
+                  flagged with failed=True so callers can skip persisting it
+        """
+        response_time = time.time() - start_time
+        logger.error("Answer generation failed after %.2fs: %s", response_time, error)
+
+        return {
+            "answer": f"I encountered an error while generating the answer: {str(error)}. Please try again.",
+            "sources": [],
+            "response_time": response_time,
+            "retrieval_count": 0,
+            "cache_hit": False,
+            "failed": True
+        }
+
+
+@lru_cache(maxsize=1)
+def get_rag() -> RAGEngine:
+    """
+    Return the process-wide RAGEngine, creating it on first use.
+
+    Cached so the Gemini model and answer caches are shared by all
+    requests (usable with FastAPI's Depends).
+
+    Returns:
+        RAGEngine: Shared RAG engine instance
+    """
+    return RAGEngine()
 
@@ -106,7 +106,13 @@ managing documents, and chatting with document content using RAG.
 """
 
 import streamlit as st
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import uuid
 import os
 from datetime import datetime
@@ -120,6 +126,15 @@ logger = logging.getLogger(__name__)
 # API URL - uses environment variable for Docker compatibility
 API_URL = os.getenv("API_URL", "http://localhost:8000")
 
+# Request bodies are encoded with orjson and sent as raw data
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Source texts are only shown as previews; the API truncates them server-side
+SOURCE_PREVIEW_LEN = 200
+
+# Messages rendered on every rerun; older ones are drawn only on request
+HISTORY_WINDOW = 40
+
 # Page configuration
 st.set_page_config(
     page_title="PDF RAG Chat",
@@ -129,32 +144,181 @@ st.set_page_config(
 )
 
 
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    Return the HTTP session shared by all backend calls.
+
+    Cached as a resource so it survives script reruns and keeps
+    connections to the API alive instead of reconnecting per request.
+
+    Returns:
+        requests.Session: Pooled HTTP session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = "pdf-rag-streamlit"
+    return session
+
+
+@st.cache_resource
+def get_fetch_pool() -> ThreadPoolExecutor:
+    """
+    Return the thread pool used to run independent API fetches concurrently.
+
+    Returns:
+        ThreadPoolExecutor: Shared pool, created once per server process
+    """
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="fetch")
+
+
+def parse_json(response: requests.Response):
+    """
+    Decode a JSON response body with orjson.
+
+    Args:
+        response (requests.Response): Response from the API
+
+    Returns:
+        Decoded JSON response
+    """
+    return orjson.loads(response.content)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def cached_get(path: str):
+    """
+    GET a backend path and cache the decoded JSON for 30 seconds.
+
+    Lets reruns from widget interactions reuse data that rarely changes.
+    Failures raise and are not cached. Call cached_get.clear() after any
+    change to backend data.
+
+    Args:
+        path (str): API path, e.g. "/documents"
+
+    Returns:
+        Decoded JSON response
+
+    Raises:
+        requests.exceptions.RequestException: If API request fails
+    """
+    response = get_http_session().get(f"{API_URL}{path}", timeout=5)
+    response.raise_for_status()
+    return parse_json(response)
+
+
 def init_session_state():
     """
     Initialize Streamlit session state variables.
 
-    Creates a new chat session if one doesn't exist and initializes
-    messages and documents lists.
+    Resumes the session named in the ``session_id`` URL parameter, or
+    starts a new one, and initializes messages, documents and sessions
+    lists. The docs_dirty and sessions_dirty flags mark the cached lists
+    for refetching.
     """
     if "session_id" not in st.session_state:
-        st.session_state.session_id = str(uuid.uuid4())
-        try:
-            response = requests.post(
-                f"{API_URL}/session",
-                json={"session_id": st.session_state.session_id},
-                timeout=5
-            )
-            response.raise_for_status()
-            logger.info(f"Created session: {st.session_state.session_id}")
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Failed to create session: {e}")
-            st.error("Failed to connect to backend. Please check if the API is running.")
+        resume_id = st.experimental_get_query_params().get("session_id", [None])[0]
+        if resume_id:
+            # The session already exists server-side; no need to create it
+            st.session_state.session_id = resume_id
+            st.session_state.messages = fetch_messages(resume_id)
+            logger.info(f"Resumed session: {resume_id}")
+        else:
+            st.session_state.session_id = str(uuid.uuid4())
+            st.experimental_set_query_params(session_id=st.session_state.session_id)
+            # POST /session is an idempotent get-or-create, and messages don't
+            # depend on it existing, so the page needn't wait for it
+            get_fetch_pool().submit(create_session, st.session_state.session_id)
 
     if "messages" not in st.session_state:
         st.session_state.messages = []
 
     if "documents" not in st.session_state:
         st.session_state.documents = []
+        st.session_state.docs_dirty = True
+
+    if "sessions" not in st.session_state:
+        st.session_state.sessions = []
+        st.session_state.sessions_dirty = True
+
+
+def create_session(session_id: str) -> None:
+    """
+    Register a chat session with the backend.
+
+    Runs on the fetch pool without a script context, so failures are
+    only logged.
+
+    Args:
+        session_id (str): Session identifier
+    """
+    try:
+        response = get_http_session().post(
+            f"{API_URL}/session",
+            data=orjson.dumps({"session_id": session_id}),
+            headers=JSON_HEADERS,
+            timeout=5
+        )
+        response.raise_for_status()
+        logger.info(f"Created session: {session_id}")
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Failed to create session {session_id}: {e}")
+
+
+def mark_lists_dirty():
+    """Drop cached API data and mark the document and session lists for refetching."""
+    cached_get.clear()
+    st.session_state.docs_dirty = True
+    st.session_state.sessions_dirty = True
+
+
+def refresh_lists():
+    """
+    Refetch the document and session lists that are marked dirty.
+
+    When both are stale the two requests run concurrently, so the wait
+    is the slower call rather than the sum of both. Session ids and
+    labels for the selector are derived here, once per fetch.
+    """
+    jobs = {}
+    if st.session_state.docs_dirty:
+        jobs["documents"] = fetch_documents
+    if st.session_state.sessions_dirty:
+        jobs["sessions"] = fetch_sessions
+
+    if len(jobs) > 1:
+        # Worker threads need the script context to use st.* calls and caches
+        ctx = get_script_run_ctx()
+
+        def run(fetch):
+            add_script_run_ctx(threading.current_thread(), ctx)
+            return fetch()
+
+        futures = {name: get_fetch_pool().submit(run, fetch) for name, fetch in jobs.items()}
+        results = {name: future.result() for name, future in futures.items()}
+    else:
+        results = {name: fetch() for name, fetch in jobs.items()}
+
+    if "documents" in results:
+        st.session_state.documents = results["documents"]
+        st.session_state.docs_dirty = False
+
+    if "sessions" in results:
+        sessions = results["sessions"]
+        # A session created in the background may not be listed yet
+        if not any(s['session_id'] == st.session_state.session_id for s in sessions):
+            current = {"session_id": st.session_state.session_id, "created_at": datetime.utcnow().isoformat()}
+            sessions = [current] + sessions
+        st.session_state.sessions = sessions
+        st.session_state.session_ids = [s['session_id'] for s in sessions]
+        st.session_state.session_labels = [
+            f"{s['session_id'][:8]}... ({s.get('created_at', '')[:10]})"
+            for s in sessions
+        ]
+        st.session_state.sessions_dirty = False
 
 
 def fetch_documents() -> List[Dict]:
@@ -168,9 +332,7 @@ def fetch_documents() -> List[Dict]:
         requests.exceptions.RequestException: If API request fails
     """
     try:
-        response = requests.get(f"{API_URL}/documents", timeout=5)
-        response.raise_for_status()
-        docs = response.json()
+        docs = cached_get("/documents")
         logger.info(f"Fetched {len(docs)} documents")
         return docs
     except requests.exceptions.RequestException as e:
@@ -183,6 +345,9 @@ def upload_document(uploaded_file) -> Optional[Dict]:
     """
     Upload a PDF file to the backend.
 
+    The multipart body is streamed from the uploaded file rather than
+    assembled in memory before sending.
+
     Args:
         uploaded_file: Streamlit UploadedFile object
 
@@ -190,14 +355,20 @@ def upload_document(uploaded_file) -> Optional[Dict]:
         Optional[Dict]: Upload response data or None if failed
     """
     try:
-        files = {"file": uploaded_file}
-        response = requests.post(
+        uploaded_file.seek(0)
+        body = MultipartEncoder(
+            fields={"file": (uploaded_file.name, uploaded_file, "application/pdf")}
+        )
+        response = get_http_session().post(
             f"{API_URL}/upload",
-            files=files,
+            data=body,
+            headers={"Content-Type": body.content_type},
             timeout=60
         )
         response.raise_for_status()
-        result = response.json()
+        result = parse_json(response)
+        cached_get.clear()
+        st.session_state.docs_dirty = True
         logger.info(f"Uploaded document: {uploaded_file.name}")
         return result
     except requests.exceptions.RequestException as e:
@@ -217,8 +388,10 @@ def delete_document(doc_id: int) -> bool:
         bool: True if successful, False otherwise
     """
     try:
-        response = requests.delete(f"{API_URL}/documents/{doc_id}", timeout=5)
+        response = get_http_session().delete(f"{API_URL}/documents/{doc_id}", timeout=5)
         response.raise_for_status()
+        cached_get.clear()
+        st.session_state.docs_dirty = True
         logger.info(f"Deleted document ID: {doc_id}")
         return True
     except requests.exceptions.RequestException as e:
@@ -246,15 +419,18 @@ def send_query(query: str, top_k: int, doc_filter: Optional[int], only_sources:
             "session_id": st.session_state.session_id,
             "top_k": top_k,
             "doc_filter": doc_filter,
-            "only_if_sources": only_sources
+            "only_if_sources": only_sources,
+            "preview_len": SOURCE_PREVIEW_LEN
         }
-        response = requests.post(
+        response = get_http_session().post(
             f"{API_URL}/query",
-            json=payload,
+            data=orjson.dumps(payload),
+            headers=JSON_HEADERS,
             timeout=30
         )
         response.raise_for_status()
-        result = response.json()
+        result = parse_json(response)
+        cached_get.clear()
         logger.info(f"Query processed in {result.get('response_time', 0):.2f}s")
         return result
     except requests.exceptions.RequestException as e:
@@ -271,11 +447,12 @@ def clear_chat_session() -> bool:
         bool: True if successful, False otherwise
     """
     try:
-        response = requests.delete(
+        response = get_http_session().delete(
             f"{API_URL}/session/{st.session_state.session_id}",
             timeout=5
         )
         response.raise_for_status()
+        cached_get.clear()
         logger.info(f"Cleared session: {st.session_state.session_id}")
         return True
     except requests.exceptions.RequestException as e:
@@ -295,9 +472,7 @@ def fetch_messages(session_id: str) -> List[Dict]:
         List[Dict]: List of message dictionaries
     """
     try:
-        response = requests.get(f"{API_URL}/messages/{session_id}", timeout=5)
-        response.raise_for_status()
-        messages = response.json()
+        messages = cached_get(f"/messages/{session_id}?preview_len={SOURCE_PREVIEW_LEN}")
         logger.info(f"Fetched {len(messages)} messages for session {session_id}")
         return messages
     except requests.exceptions.RequestException as e:
@@ -313,10 +488,7 @@ def fetch_sessions() -> List[Dict]:
         List[Dict]: List of session dictionaries
     """
     try:
-        response = requests.get(f"{API_URL}/sessions", timeout=5)
-        response.raise_for_status()
-        sessions = response.json()
-        return sessions
+        return cached_get("/sessions")
     except requests.exceptions.RequestException as e:
         logger.error(f"Failed to fetch sessions: {e}")
         return []
@@ -332,28 +504,47 @@ def render_sidebar():
     with st.sidebar:
         st.header("📁 Documents")
 
+        # Lists are only refetched when marked dirty, so adjusting a
+        # setting doesn't cost a round-trip to the API. The callback runs
+        # before the rerun, so refresh_lists() picks up the new flags.
+        st.button("🔄 Refresh", use_container_width=True, on_click=mark_lists_dirty)
+
+        # One document list per rerun, shared by the upload check, the
+        # list below and the filter selectbox
+        docs = st.session_state.documents
+        doc_ids = {d['filename']: d['id'] for d in docs}
+
         # File uploader
         uploaded = st.file_uploader("Upload PDF", type=["pdf"], key="uploader")
 
-        if uploaded:
-            # Check if already uploaded
-            existing_files = [d['filename'] for d in st.session_state.get('documents', [])]
+        if not uploaded:
+            st.session_state.pop("handled_upload", None)
+        else:
+            # The file stays in the uploader across reruns; send it only once
+            upload_key = (uploaded.name, uploaded.size)
+            handled = st.session_state.get("handled_upload")
 
-            if uploaded.name not in existing_files:
+            if handled and handled[0] == upload_key:
+                st.info(handled[1])
+            elif uploaded.name in doc_ids:
+                st.info(f"📄 {uploaded.name} already uploaded")
+            else:
                 with st.spinner(f"Processing {uploaded.name}..."):
                     result = upload_document(uploaded)
 
-                    if result:
-                        st.success(f"✅ {uploaded.name} ({result.get('page_count', 0)} pages)")
-                        st.session_state.documents = fetch_documents()
-                        st.rerun()
-            else:
-                st.info(f"📄 {uploaded.name} already uploaded")
+                if result and result.get("duplicate"):
+                    message = f"📄 Same content already uploaded as {result['filename']}"
+                elif result:
+                    message = f"✅ {uploaded.name} uploaded, processing in background"
+                else:
+                    message = f"Upload of {uploaded.name} failed; remove and re-add the file to retry"
+                st.session_state.handled_upload = (upload_key, message)
 
-        # Display documents
-        docs = fetch_documents()
-        st.session_state.documents = docs
+                if result and not result.get("duplicate"):
+                    st.rerun()
+                st.info(message)
 
+        # Display documents
         if not docs:
             st.info("No documents uploaded yet")
 
@@ -374,16 +565,9 @@ def render_sidebar():
         st.header("⚙️ Settings")
         top_k = st.slider("Top K Results", 1, 10, 5, help="Number of document chunks to retrieve")
 
-        doc_options = ["All Documents"] + [f"{d['filename']}" for d in docs]
+        doc_options = ["All Documents"] + list(doc_ids)
         doc_selection = st.selectbox("Filter by Document", doc_options)
-        doc_filter = None
-
-        if doc_selection != "All Documents":
-            # Find document ID
-            for d in docs:
-                if d['filename'] == doc_selection:
-                    doc_filter = d['id']
-                    break
+        doc_filter = doc_ids.get(doc_selection)
 
         only_sources = st.checkbox(
             "Only answer if sources found",
@@ -403,6 +587,45 @@ def render_sidebar():
         return top_k, doc_filter, only_sources
 
 
+def source_labels(msg: Dict) -> List[str]:
+    """
+    Return the caption lines for a message's sources, formatting them once.
+
+    The labels are stored on the message, so later reruns reuse them.
+
+    Args:
+        msg (Dict): Assistant message with sources
+
+    Returns:
+        List[str]: One caption per source
+    """
+    if "source_labels" not in msg:
+        msg["source_labels"] = [
+            f"**{i}. {s['filename']}** (Page {s['page']}) - Relevance: {s['score']:.3f}"
+            for i, s in enumerate(msg['sources'], 1)
+        ]
+    return msg["source_labels"]
+
+
+def render_message(msg: Dict):
+    """
+    Render one chat message with its sources.
+
+    Args:
+        msg (Dict): Message with role, content and optional sources
+    """
+    with st.chat_message(msg['role']):
+        st.markdown(msg['content'])
+
+        # Show sources for assistant messages
+        if msg['role'] == 'assistant' and msg.get('sources'):
+            with st.expander(f"📚 Sources ({len(msg['sources'])})"):
+                for label, s in zip(source_labels(msg), msg['sources']):
+                    st.caption(label)
+                    st.text(s['text_preview'])
+                    st.divider()
+
+
 def render_chat_interface(top_k: int, doc_filter: Optional[int], only_sources: bool):
     """
     Render the main chat interface.
@@ -416,14 +639,9 @@ def render_chat_interface(top_k: int, doc_filter: Optional[int], only_sources: b
 
     with col2:
         st.subheader("💬 Sessions")
-        sessions = fetch_sessions()
-
-        if sessions:
-            session_ids = [s['session_id'] for s in sessions]
-            session_labels = [
-                f"{s['session_id'][:8]}... ({s.get('created_at', '')[:10]})"
-                for s in sessions
-            ]
+        if st.session_state.sessions:
+            session_ids = st.session_state.session_ids
+            session_labels = st.session_state.session_labels
 
             current_index = 0
             if st.session_state.session_id in session_ids:
@@ -441,26 +659,22 @@ def render_chat_interface(top_k: int, doc_filter: Optional[int], only_sources: b
             if selected_id != st.session_state.session_id:
                 st.session_state.session_id = selected_id
                 st.session_state.messages = fetch_messages(selected_id)
+                # Keep the URL pointing at the open session so a reload resumes it
+                st.experimental_set_query_params(session_id=selected_id)
                 st.rerun()
 
     with col1:
         st.header("💬 Chat")
 
-        # Display chat messages
-        for msg in st.session_state.messages:
-            with st.chat_message(msg['role']):
-                st.write(msg['content'])
-
-                # Show sources for assistant messages
-                if msg['role'] == 'assistant' and msg.get('sources'):
-                    with st.expander(f"📚 Sources ({len(msg['sources'])})"):
-                        for i, s in enumerate(msg['sources'], 1):
-                            st.caption(
-                                f"**{i}. {s['filename']}** (Page {s['page']}) "
-                                f"- Relevance: {s['score']:.3f}"
-                            )
-                            st.text(s['text'][:200] + "..." if len(s['text']) > 200 else s['text'])
-                            st.divider()
+        # Every rerun redraws the history, so only the latest messages are
+        # drawn unless the user asks for the rest
+        messages = st.session_state.messages
+        earlier = len(messages) - HISTORY_WINDOW
+        if earlier > 0 and not st.toggle(f"Show {earlier} earlier messages", key="show_history"):
+            messages = messages[earlier:]
+
+        for msg in messages:
+            render_message(msg)
 
     # Chat input OUTSIDE columns - this is the fix!
     if query := st.chat_input("Ask about your PDFs..."):
@@ -490,6 +704,9 @@ def main():
     # Initialize session state
     init_session_state()
 
+    # Fetch stale lists up front, concurrently
+    refresh_lists()
+
     # Render sidebar and get settings
     top_k, doc_filter, only_sources = render_sidebar()
 
@@ -59,20 +59,42 @@ This module provides vector storage and similarity search functionality using
 Qdrant as the vector database and sentence-transformers for generating embeddings.
 """
 
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue
-from qdrant_client.http.exceptions import UnexpectedResponse
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Optional
+from qdrant_client import AsyncQdrantClient, QdrantClient
+from qdrant_client.models import (
+    Batch, Distance, VectorParams, Filter, FieldCondition, MatchValue, MatchAny, FilterSelector,
+    SearchRequest, SearchParams, QuantizationSearchParams, ScalarQuantization, ScalarQuantizationConfig, ScalarType
+)
+from functools import lru_cache
+from typing import List, Dict, Optional, Tuple
+import asyncio
 import uuid
 import logging
 
 from config import cfg
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Texts per forward pass when embedding document chunks
+ENCODE_BATCH_SIZE = 64
+
+# Points per Qdrant upsert request when indexing a document
+UPSERT_BATCH_SIZE = 256
+
+# Concurrent query embeddings are encoded together: up to this many texts...
+QUERY_BATCH_MAX = 32
+# ...collected for at most this many seconds after the first one arrives
+QUERY_BATCH_WAIT = 0.01
+
+# int8 copies of the chunk vectors, kept in RAM; originals stay on disk for rescoring
+CHUNK_QUANTIZATION = ScalarQuantization(
+    scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+)
+
+# Search the int8 vectors for 2x candidates, then rescore those with the originals
+CHUNK_SEARCH_PARAMS = SearchParams(
+    quantization=QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
 
 class VectorDB:
     """
@@ -84,79 +106,135 @@ class VectorDB:
 
     Attributes:
         client (QdrantClient): Qdrant database client
+        aclient (AsyncQdrantClient): Qdrant client for the async (a*) methods
         model (SentenceTransformer): Embedding model for text vectorization
         collection (str): Name of the Qdrant collection
+        cache_collection (str): Name of the Qdrant collection holding cached answers
     """
 
-    def __init__(self, collection_name: str = "pdf_chunks"):
+    def __init__(self, collection_name: str = "pdf_chunks", cache_collection_name: str = "query_cache"):
         """
         Initialize vector database connection and embedding model.
 
         Args:
             collection_name (str): Name of the Qdrant collection to use
+            cache_collection_name (str): Name of the semantic answer cache collection
 
         Raises:
             Exception: If connection to Qdrant fails
             Exception: If embedding model cannot be loaded
         """
         try:
-            self.client = QdrantClient(host=cfg.QDRANT_HOST, port=cfg.QDRANT_PORT)
-            logger.info(f"Connected to Qdrant at {cfg.QDRANT_HOST}:{cfg.QDRANT_PORT}")
+            # gRPC frames are much cheaper than JSON for dense vector payloads
+            connection = dict(
+                host=cfg.QDRANT_HOST,
+                port=cfg.QDRANT_PORT,
+                grpc_port=cfg.QDRANT_GRPC_PORT,
+                prefer_grpc=cfg.QDRANT_PREFER_GRPC
+            )
+            self.client = QdrantClient(**connection)
+            # Used from the event loop so requests don't tie up a worker thread
+            self.aclient = AsyncQdrantClient(**connection)
+            logger.info(
+                f"Connected to Qdrant at {cfg.QDRANT_HOST}:{cfg.QDRANT_PORT} "
+                f"(gRPC {cfg.QDRANT_GRPC_PORT}, prefer_grpc={cfg.QDRANT_PREFER_GRPC})"
+            )
         except Exception as e:
             logger.error(f"Failed to connect to Qdrant: {e}")
             raise Exception(f"Qdrant connection failed: {str(e)}")
 
         try:
+            # Imported here: torch is heavy, and importing this module shouldn't load it
+            from sentence_transformers import SentenceTransformer
+
+            import torch
+
             self.model = SentenceTransformer(cfg.EMBEDDING_MODEL)
-            logger.info(f"Loaded embedding model: {cfg.EMBEDDING_MODEL}")
+            if torch.cuda.is_available():
+                # Half precision doubles GPU throughput; CPUs stay on float32
+                self.model = self.model.half().to("cuda")
+                if cfg.EMBEDDING_COMPILE:
+                    self.model[0].auto_model = torch.compile(self.model[0].auto_model, dynamic=True)
+            logger.info(f"Loaded embedding model: {cfg.EMBEDDING_MODEL} on {self.model.device}")
         except Exception as e:
             logger.error(f"Failed to load embedding model: {e}")
             raise Exception(f"Embedding model loading failed: {str(e)}")
 
         self.collection = collection_name
+        self.cache_collection = cache_collection_name
         self._init_collection()
 
+        # Created on first aembed() call, inside the serving event loop
+        self._encode_queue: Optional[asyncio.Queue] = None
+        self._encode_task: Optional[asyncio.Task] = None
+
     def _init_collection(self) -> None:
         """
-        Initialize Qdrant collection if it doesn't exist.
+        Initialize Qdrant collections if they don't exist.
 
-        Creates a new collection with appropriate vector configuration
-        based on the embedding model's dimension.
+        Creates the document chunk collection and the semantic answer cache
+        collection with vector configuration based on the embedding model's
+        dimension. Embeddings are normalized at encode time, so new
+        collections use dot-product distance, which ranks exactly like cosine
+        without normalizing per comparison. Existing cosine collections keep
+        working unchanged. The chunk collection stores int8-quantized vectors;
+        an existing one without quantization is switched over in place.
 
         Raises:
             Exception: If collection creation fails
         """
         try:
             collections = [c.name for c in self.client.get_collections().collections]
-
-            if self.collection not in collections:
-                vector_size = self.model.get_sentence_embedding_dimension()
-                self.client.create_collection(
-                    collection_name=self.collection,
-                    vectors_config=VectorParams(
-                        size=vector_size,
-                        distance=Distance.COSINE
+            vector_size = self.model.get_sentence_embedding_dimension()
+
+            for name in (self.collection, self.cache_collection):
+                quantization = CHUNK_QUANTIZATION if name == self.collection else None
+                if name not in collections:
+                    self.client.create_collection(
+                        collection_name=name,
+                        vectors_config=VectorParams(
+                            size=vector_size,
+                            distance=Distance.DOT
+                        ),
+                        quantization_config=quantization
                     )
-                )
-                logger.info(f"Created collection '{self.collection}' with vector size {vector_size}")
-            else:
-                logger.info(f"Collection '{self.collection}' already exists")
+                    logger.info(f"Created collection '{name}' with vector size {vector_size}")
+                else:
+                    logger.info(f"Collection '{name}' already exists")
+                    info = self.client.get_collection(name)
+                    if quantization is not None and info.config.quantization_config is None:
+                        self.client.update_collection(collection_name=name, quantization_config=quantization)
+                        logger.info(f"Enabled int8 scalar quantization on '{name}'")
 
         except Exception as e:
             logger.error(f"Failed to initialize collection: {e}")
             raise Exception(f"Collection initialization failed: {str(e)}")
 
-    def add_chunks(self, chunks: List[Dict], doc_id: int, filename: str) -> int:
+    async def aadd_chunks(
+            self,
+            chunks: Dict,
+            doc_id: int,
+            filename: str,
+            wait: bool = True,
+            start: int = 0
+    ) -> int:
         """
         Add document chunks to the vector database.
 
-        Embeds each chunk and stores it in Qdrant with metadata including
-        document ID, filename, page number, and chunk ID.
+        Embeds all chunks in one batched model call on a worker thread and
+        stores them in Qdrant with metadata including document ID, filename, page number, and chunk
+        ID. Points are sent in columnar batch upserts of UPSERT_BATCH_SIZE,
+        so a large document never becomes one oversized request.
 
         Args:
-            chunks (List[Dict]): List of chunk dictionaries with 'text' and 'page' keys
+            chunks (Dict): Columnar chunk batch with 'text' and 'page' columns
             doc_id (int): Database ID of the source document
             filename (str): Name of the source document
+            wait (bool): Wait for Qdrant to apply the write before returning.
+                With False the points become searchable shortly after.
+                Only the last batch waits; earlier ones are pipelined.
+            start (int): chunk_id of the first chunk, for documents indexed
+                in several calls
 
         Returns:
             int: Number of chunks successfully added
@@ -166,44 +244,172 @@ class VectorDB:
             Exception: If embedding or insertion fails
 
         Example:
-            chunks = [{"text": "...", "page": 1}, {"text": "...", "page": 2}]
-            count = vdb.add_chunks(chunks, doc_id=1, filename="doc.pdf")
+            chunks = {"text": ["...", "..."], "page": array("i", [1, 2])}
+            count = await vdb.aadd_chunks(chunks, doc_id=1, filename="doc.pdf")
         """
-        if not chunks:
+        if not chunks["text"]:
             logger.warning(f"No chunks to add for document {doc_id}")
             raise ValueError("Chunks list cannot be empty")
 
         try:
-            points = []
-            for i, chunk in enumerate(chunks):
-                # Generate embedding
-                vec = self.model.encode(chunk["text"]).tolist()
-
-                # Create point with metadata
-                point = PointStruct(
-                    id=str(uuid.uuid4()),
-                    vector=vec,
-                    payload={
-                        "text": chunk["text"],
-                        "page": chunk["page"],
-                        "doc_id": doc_id,
-                        "filename": filename,
-                        "chunk_id": i
-                    }
+            ids, vectors, payloads = await asyncio.to_thread(self._build_points, chunks, doc_id, filename, start)
+
+            # Qdrant applies updates in order, so waiting on the last batch
+            # also covers the ones sent before it
+            last = (len(ids) - 1) // UPSERT_BATCH_SIZE * UPSERT_BATCH_SIZE
+            for start in range(0, len(ids), UPSERT_BATCH_SIZE):
+                stop = start + UPSERT_BATCH_SIZE
+                await self.aclient.upsert(
+                    collection_name=self.collection,
+                    points=Batch(ids=ids[start:stop], vectors=vectors[start:stop], payloads=payloads[start:stop]),
+                    wait=wait and start == last
                 )
-                points.append(point)
+            logger.info(f"Added {len(ids)} chunks for document {doc_id} ({filename})")
 
-            # Batch upsert
-            self.client.upsert(collection_name=self.collection, points=points)
-            logger.info(f"Added {len(points)} chunks for document {doc_id} ({filename})")
-
-            return len(points)
+            return len(ids)
 
         except Exception as e:
             logger.error(f"Failed to add chunks for document {doc_id}: {e}")
             raise Exception(f"Chunk insertion failed: {str(e)}")
 
-    def search(self, query: str, top_k: int = 5, doc_filter: Optional[int] = None) -> List[Dict]:
+    def _build_points(
+            self,
+            chunks: Dict,
+            doc_id: int,
+            filename: str,
+            start: int = 0
+    ) -> Tuple[List[str], List, List[Dict]]:
+        """
+        Embed chunks and build the columns of a Qdrant Batch.
+
+        Args:
+            chunks (Dict): Columnar chunk batch with 'text' and 'page' columns
+            doc_id (int): Database ID of the source document
+            filename (str): Name of the source document
+            start (int): chunk_id of the first chunk
+
+        Returns:
+            Tuple[List[str], List, List[Dict]]: Point ids, vectors and payloads
+        """
+        texts = chunks["text"]
+        # One batched forward pass instead of one encode() per chunk
+        vectors = self.model.encode(
+            texts,
+            batch_size=ENCODE_BATCH_SIZE,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        ).tolist()
+        ids = [str(uuid.uuid4()) for _ in texts]
+        payloads = [
+            {
+                "text": text,
+                "page": page,
+                "doc_id": doc_id,
+                "filename": filename,
+                "chunk_id": i
+            }
+            for i, (text, page) in enumerate(zip(texts, chunks["page"]), start)
+        ]
+        return ids, vectors, payloads
+
+    def embed(self, text: str) -> List[float]:
+        """
+        Embed a single text with the loaded sentence-transformer model.
+
+        Args:
+            text (str): Text to embed
+
+        Returns:
+            List[float]: Unit-length embedding vector
+        """
+        return self.model.encode(text, normalize_embeddings=True).tolist()
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts in one model call.
+
+        Args:
+            texts (List[str]): Texts to embed
+
+        Returns:
+            List[List[float]]: One unit-length embedding vector per text, in input order
+        """
+        return self.model.encode(texts, normalize_embeddings=True).tolist()
+
+    async def aembed(self, text: str) -> List[float]:
+        """
+        Async variant of embed().
+
+        Queries embedded concurrently are batched: the text is queued and
+        encoded together with any others that arrive within QUERY_BATCH_WAIT,
+        in one model call on a worker thread.
+
+        Args:
+            text (str): Text to embed
+
+        Returns:
+            List[float]: Unit-length embedding vector
+        """
+        if self._encode_task is None or self._encode_task.done():
+            self._encode_queue = asyncio.Queue()
+            self._encode_task = asyncio.create_task(self._encode_batches())
+
+        future = asyncio.get_running_loop().create_future()
+        await self._encode_queue.put((text, future))
+        return await future
+
+    async def _encode_batches(self) -> None:
+        """
+        Serve queued aembed() calls in batches until cancelled.
+
+        Waits for a first text, gathers more for up to QUERY_BATCH_WAIT
+        seconds or QUERY_BATCH_MAX texts, encodes them with one embed_batch()
+        call and resolves each caller's future with its row.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._encode_queue.get()]
+            deadline = loop.time() + QUERY_BATCH_WAIT
+            while len(batch) < QUERY_BATCH_MAX:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._encode_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Callers that gave up while queued don't need a vector
+            batch = [(text, future) for text, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            try:
+                vectors = await asyncio.to_thread(self.embed_batch, [text for text, _ in batch])
+            except Exception as e:
+                logger.error(f"Batched query embedding failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            logger.debug("Embedded %s queries in one batch", len(batch))
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    async def aembed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Async variant of embed_batch(); encoding runs in a worker thread."""
+        return await asyncio.to_thread(self.embed_batch, texts)
+
+    async def asearch(
+            self,
+            query: str,
+            top_k: int = 5,
+            doc_filter: Optional[int] = None,
+            query_vector: Optional[List[float]] = None
+    ) -> List[Dict]:
         """
         Search for similar chunks using semantic similarity.
 
@@ -214,6 +420,8 @@ class VectorDB:
             query (str): Search query text
             top_k (int): Number of results to return (default: 5)
             doc_filter (int, optional): Filter results by document ID
+            query_vector (List[float], optional): Precomputed query embedding;
+                skips encoding when given
 
         Returns:
             List[Dict]: List of matching chunks with text, page, filename, and score
@@ -223,58 +431,144 @@ class VectorDB:
             Exception: If search operation fails
 
         Example:
-            results = vdb.search("What is machine learning?", top_k=3)
+            results = await vdb.asearch("What is machine learning?", top_k=3)
             # results = [{"text": "...", "page": 1, "filename": "...", "score": 0.85}, ...]
         """
+        self._check_search_args(query, top_k)
+
+        try:
+            # Generate query embedding unless the caller already has it
+            vec = query_vector if query_vector is not None else await self.aembed(query)
+
+            results = await self.aclient.search(
+                collection_name=self.collection,
+                query_vector=vec,
+                limit=top_k,
+                query_filter=self._doc_filter(doc_filter),
+                search_params=CHUNK_SEARCH_PARAMS
+            )
+
+            formatted_results = self._format_results(results)
+
+            logger.info("Search returned %s results for query: '%s...'", len(formatted_results), query[:50])
+            return formatted_results
+
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise Exception(f"Search operation failed: {str(e)}")
+
+    def _check_search_args(self, query: str, top_k: int) -> None:
+        """
+        Validate search arguments.
+
+        Raises:
+            ValueError: If query is empty or top_k is invalid
+        """
         if not query or not query.strip():
             logger.warning("Empty query provided")
             raise ValueError("Query cannot be empty")
 
         if top_k < 1:
-            logger.warning(f"Invalid top_k value: {top_k}")
+            logger.warning("Invalid top_k value: %s", top_k)
             raise ValueError("top_k must be at least 1")
 
-        try:
-            # Generate query embedding
-            vec = self.model.encode(query).tolist()
-
-            # Build filter if document filter is specified
-            filter_obj = None
-            if doc_filter is not None:
-                filter_obj = Filter(
-                    must=[FieldCondition(key="doc_id", match=MatchValue(value=doc_filter))]
-                )
+    def _doc_filter(self, doc_filter: Optional[int]) -> Optional[Filter]:
+        """
+        Build the Qdrant filter restricting a search to one document.
+
+        Args:
+            doc_filter (int, optional): Document ID, or None for all documents
+
+        Returns:
+            Optional[Filter]: Filter on doc_id, or None
+        """
+        if doc_filter is None:
+            return None
+        return Filter(must=[FieldCondition(key="doc_id", match=MatchValue(value=doc_filter))])
+
+    async def asearch_batch(
+            self,
+            query_vectors: List[List[float]],
+            top_k: int = 5,
+            doc_filter: Optional[int] = None
+    ) -> List[List[Dict]]:
+        """
+        Search for several precomputed query embeddings in one request.
+
+        Args:
+            query_vectors (List[List[float]]): Query embeddings, e.g. from aembed_batch()
+            top_k (int): Number of results per query (default: 5)
+            doc_filter (int, optional): Filter results by document ID
+
+        Returns:
+            List[List[Dict]]: Matching chunks per query, in input order
+
+        Raises:
+            ValueError: If top_k is invalid
+            Exception: If search operation fails
+        """
+        if top_k < 1:
+            logger.warning("Invalid top_k value: %s", top_k)
+            raise ValueError("top_k must be at least 1")
 
-            # Perform search
-            results = self.client.search(
+        try:
+            # One round-trip for every query
+            batches = await self.aclient.search_batch(
                 collection_name=self.collection,
-                query_vector=vec,
-                limit=top_k,
-                query_filter=filter_obj
+                requests=self._search_requests(query_vectors, top_k, doc_filter)
             )
 
-            # Format results
-            formatted_results = [
-                {
-                    "text": r.payload["text"],
-                    "page": r.payload["page"],
-                    "filename": r.payload["filename"],
-                    "score": r.score
-                }
-                for r in results
-            ]
-
-            logger.info(f"Search returned {len(formatted_results)} results for query: '{query[:50]}...'")
-            return formatted_results
+            logger.info("Batch search ran %s queries", len(query_vectors))
+            return [self._format_results(results) for results in batches]
 
-        except UnexpectedResponse as e:
-            logger.error(f"Qdrant search error: {e}")
-            raise Exception(f"Search operation failed: {str(e)}")
         except Exception as e:
-            logger.error(f"Search failed: {e}")
+            logger.error(f"Batch search failed: {e}")
             raise Exception(f"Search operation failed: {str(e)}")
 
-    def delete_doc(self, doc_id: int) -> None:
+    def _search_requests(
+            self,
+            query_vectors: List[List[float]],
+            top_k: int,
+            doc_filter: Optional[int]
+    ) -> List[SearchRequest]:
+        """
+        Build one SearchRequest per query vector for a batch search.
+
+        Args:
+            query_vectors (List[List[float]]): Query embeddings
+            top_k (int): Number of results per query
+            doc_filter (int, optional): Filter results by document ID
+
+        Returns:
+            List[SearchRequest]: Requests in input order
+        """
+        filter_obj = self._doc_filter(doc_filter)
+        return [
+            SearchRequest(vector=vec, limit=top_k, filter=filter_obj, params=CHUNK_SEARCH_PARAMS, with_payload=True)
+            for vec in query_vectors
+        ]
+
+    def _format_results(self, results: List) -> List[Dict]:
+        """
+        Convert scored Qdrant points into source dictionaries.
+
+        Args:
+            results (List[ScoredPoint]): Points returned by a search
+
+        Returns:
+            List[Dict]: Chunks with text, page, filename, and score
+        """
+        return [
+            {
+                "text": r.payload["text"],
+                "page": r.payload["page"],
+                "filename": r.payload["filename"],
+                "score": r.score
+            }
+            for r in results
+        ]
+
+    async def adelete_doc(self, doc_id: int) -> None:
         """
         Delete all chunks associated with a document.
 
@@ -287,10 +581,10 @@ class VectorDB:
             Exception: If deletion fails
 
         Example:
-            vdb.delete_doc(doc_id=1)
+            await vdb.adelete_doc(doc_id=1)
         """
         try:
-            self.client.delete(
+            await self.aclient.delete(
                 collection_name=self.collection,
                 points_selector=Filter(
                     must=[FieldCondition(key="doc_id", match=MatchValue(value=doc_id))]
@@ -302,6 +596,133 @@ class VectorDB:
             logger.error(f"Failed to delete document {doc_id}: {e}")
             raise Exception(f"Document deletion failed: {str(e)}")
 
+    def delete_docs_bulk(self, doc_ids: List[int]) -> None:
+        """
+        Delete all chunks belonging to any of the given documents.
+
+        Issues a single filtered delete instead of one request per document.
 
-# Global vector database instance
-vdb = VectorDB()
\ No newline at end of file
+        Args:
+            doc_ids (List[int]): Database IDs of the documents to delete
+
+        Raises:
+            Exception: If deletion fails
+
+        Example:
+            vdb.delete_docs_bulk([1, 2, 3])
+        """
+        if not doc_ids:
+            return
+
+        try:
+            self.client.delete(
+                collection_name=self.collection,
+                points_selector=FilterSelector(
+                    filter=Filter(
+                        must=[FieldCondition(key="doc_id", match=MatchAny(any=doc_ids))]
+                    )
+                )
+            )
+            logger.info(f"Deleted all chunks for {len(doc_ids)} documents")
+
+        except Exception as e:
+            logger.error(f"Failed to bulk delete {len(doc_ids)} documents: {e}")
+            raise Exception(f"Bulk document deletion failed: {str(e)}")
+
+    async def acache_lookup(
+            self,
+            query_vector: List[float],
+            scope: str,
+            corpus_version: int,
+            threshold: float
+    ) -> Optional[Dict]:
+        """
+        Find a cached answer for a semantically equivalent earlier query.
+
+        Args:
+            query_vector (List[float]): Embedding of the incoming query
+            scope (str): Retrieval parameters the answer must have been produced with
+            corpus_version (int): Corpus version the answer must belong to
+            threshold (float): Minimum cosine similarity for a hit
+
+        Returns:
+            Optional[Dict]: Cached payload (answer, sources, retrieval_count) or None
+        """
+        try:
+            hits = await self.aclient.search(
+                collection_name=self.cache_collection,
+                query_vector=query_vector,
+                limit=1,
+                score_threshold=threshold,
+                query_filter=self._cache_filter(scope, corpus_version)
+            )
+        except Exception as e:
+            # A cache failure must never fail the query itself
+            logger.warning("Semantic cache lookup failed: %s", e)
+            return None
+
+        return hits[0].payload if hits else None
+
+    def _cache_filter(self, scope: str, corpus_version: int) -> Filter:
+        """
+        Build the filter matching cache entries for one scope and corpus version.
+
+        Args:
+            scope (str): Retrieval parameters the answer must have been produced with
+            corpus_version (int): Corpus version the answer must belong to
+
+        Returns:
+            Filter: Qdrant filter on scope and corpus_version
+        """
+        return Filter(must=[
+            FieldCondition(key="scope", match=MatchValue(value=scope)),
+            FieldCondition(key="corpus_version", match=MatchValue(value=corpus_version))
+        ])
+
+    async def acache_store(self, query_vector: List[float], payload: Dict) -> None:
+        """
+        Store a generated answer in the semantic cache.
+
+        Args:
+            query_vector (List[float]): Embedding of the answered query
+            payload (Dict): Answer, sources, retrieval_count, scope and corpus_version
+        """
+        try:
+            await self.aclient.upsert(
+                collection_name=self.cache_collection,
+                points=Batch(ids=[str(uuid.uuid4())], vectors=[query_vector], payloads=[payload])
+            )
+        except Exception as e:
+            logger.warning("Semantic cache store failed: %s", e)
+
+    def cache_clear(self, keep_version: int) -> None:
+        """
+        Drop cached answers that belong to any other corpus version.
+
+        Args:
+            keep_version (int): Corpus version whose entries are kept
+        """
+        try:
+            self.client.delete(
+                collection_name=self.cache_collection,
+                points_selector=Filter(
+                    must_not=[FieldCondition(key="corpus_version", match=MatchValue(value=keep_version))]
+                )
+            )
+            logger.info(f"Cleared semantic cache entries older than version {keep_version}")
+        except Exception as e:
+            logger.warning(f"Semantic cache clear failed: {e}")
+
+
+@lru_cache(maxsize=1)
+def get_vdb() -> VectorDB:
+    """
+    Return the process-wide VectorDB, creating it on first use.
+
+    Cached so the Qdrant client and embedding model are loaded once per
+    process and shared by all requests (usable with FastAPI's Depends).
+
+    Returns:
+        VectorDB: Shared vector database instance
+    """
+    return VectorDB()